@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import { BrowserRouter as Router, Routes, Route } from "react-router-dom";
 import Navbar from "./components/Navbar";
 import RecipeCard from "./components/RecipeCard";
@@ -12,62 +12,87 @@ import ShareRecipeModal from './components/ShareRecipeModal';
 import Profile from "./components/Profile";
 
 const API_BASE_URL = "/api";
+const PAGE_SIZE = 24;
 
 function Homepage() {
   const { user } = useAuth();
-  const { t } = useLanguage(); // 🔥 Translation hook lagaya!
+  const { t, language } = useLanguage(); // 🔥 Translation hook lagaya!
 
   const [showAuth, setShowAuth] = useState(false);
   const [showShareModal, setShowShareModal] = useState(false);
   const [searchQuery, setSearchQuery] = useState("");
+  const [searchTerm, setSearchTerm] = useState("");
   const [isVoiceModalOpen, setIsVoiceModalOpen] = useState(false);
   
   const [recipes, setRecipes] = useState([]);
-  const [filteredRecipes, setFilteredRecipes] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const latestRequest = useRef(0);
   
   const [selectedCountry, setSelectedCountry] = useState("All");
   const [selectedState, setSelectedState] = useState("All");
-  const statesList = ["All", "Maharashtra", "Punjab", "Uttar Pradesh", "Bihar", "Tamil Nadu", "Rajasthan", "Gujarat"];
+  const [facets, setFacets] = useState(null);
+  const defaultStates = ["Maharashtra", "Punjab", "Uttar Pradesh", "Bihar", "Tamil Nadu", "Rajasthan", "Gujarat"];
 
+  // 🔥 Sidebar ke options + counts server se (/recipes/facets); India chuna ho to states usi ke andar gine jaate hain
+  useEffect(() => {
+    const params = new URLSearchParams();
+    if (selectedCountry !== "All") params.set("country", selectedCountry);
+    fetch(`${API_BASE_URL}/recipes/facets?${params}`)
+      .then(res => res.json())
+      .then(setFacets)
+      .catch(err => console.error("Facets failed", err));
+  }, [selectedCountry]);
+
+  const stateCounts = facets?.state || {};
+  const countryCounts = facets?.country || {};
+  const statesList = ["All", ...(facets ? Object.keys(stateCounts).filter(s => s !== "All").sort() : defaultStates)];
+  const withCount = (label, count) => count === undefined ? label : `${label} (${count})`;
+
+  // 🔥 Search box server pe jaata hai (/search, poora catalog), par typing rukne ke baad hi
+  useEffect(() => {
+    const timer = setTimeout(() => setSearchTerm(searchQuery.trim()), 300);
+    return () => clearTimeout(timer);
+  }, [searchQuery]);
+
+  // Language, country/state filter ya search badalte hi pehla page dobara (filter server pe lagta hai)
   useEffect(() => {
     fetchRecipes();
-  }, []);
+  }, [language, selectedCountry, selectedState, searchTerm]);
 
-  const fetchRecipes = async () => {
+  // 🔥 Paginated fetch: pehla page turant, baaki "Load More" pe (cursor server deta hai)
+  const fetchRecipes = async (cursor = null) => {
+    const requestId = ++latestRequest.current;
     try {
-      const response = await fetch(`${API_BASE_URL}/recipes`);
+      if (cursor) setLoadingMore(true);
+      // Grid sirf cards dikhata hai: server ka recipe_card read model (ingredients/steps/comments nahi)
+      const params = new URLSearchParams({ limit: PAGE_SIZE, lang: language });
+      if (selectedCountry !== "All") params.set("country", selectedCountry);
+      if (selectedCountry === "India" && selectedState !== "All") params.set("state", selectedState);
+      let url = `${API_BASE_URL}/recipes/cards`;
+      if (searchTerm) {
+        // Search results ranked aate hain, ek hi page (Load More nahi)
+        params.set("q", searchTerm);
+        params.set("fields", "card");
+        url = `${API_BASE_URL}/search`;
+      } else if (cursor) {
+        params.set("cursor", cursor);
+      }
+      const response = await fetch(`${url}?${params}`);
       const data = await response.json();
-      setRecipes(data);
-      setFilteredRecipes(data);
-      setLoading(false);
+      // Tez typing me purana response naye ke baad aa sakta hai: sirf latest request ka result dikhao
+      if (requestId !== latestRequest.current) return;
+      setRecipes(prev => cursor ? [...prev, ...data] : data);
+      setNextCursor(response.headers.get("X-Next-Cursor"));
     } catch (error) {
       console.error("Error fetching recipes:", error);
+    } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
-  useEffect(() => {
-    let result = recipes;
-
-    if (searchQuery.trim() !== "") {
-      result = result.filter(r => 
-        (r.title && r.title.toLowerCase().includes(searchQuery.toLowerCase())) || 
-        (r.description && r.description.toLowerCase().includes(searchQuery.toLowerCase()))
-      );
-    }
-
-    if (selectedCountry !== "All") {
-      result = result.filter(r => r.country === selectedCountry);
-    }
-
-    if (selectedCountry === "India" && selectedState !== "All") {
-      result = result.filter(r => r.state === selectedState);
-    }
-
-    setFilteredRecipes(result);
-  }, [searchQuery, selectedCountry, selectedState, recipes]);
-
   return (
     <div className="min-h-screen bg-gray-50 relative">
       
@@ -111,9 +136,9 @@ function Homepage() {
                 setSelectedState("All"); 
               }}
             >
-              <option value="All">All (Mixed)</option>
-              <option value="India">India</option>
-              <option value="Foreign">Foreign</option>
+              <option value="All">{withCount("All (Mixed)", facets?.total)}</option>
+              <option value="India">{withCount("India", countryCounts.India)}</option>
+              <option value="Foreign">{withCount("Foreign", countryCounts.Foreign)}</option>
             </select>
           </div>
 
@@ -131,7 +156,7 @@ function Homepage() {
                       : "text-gray-600 hover:bg-orange-50"
                     }`}
                   >
-                    {state}
+                    {state === "All" ? state : withCount(state, stateCounts[state])}
                   </button>
                 ))}
               </div>
@@ -144,19 +169,19 @@ function Homepage() {
           <div className="flex justify-between items-center mb-8">
             <h2 className="text-3xl font-bold text-gray-800">
               {selectedCountry === "All" ? t('allRecipes') : selectedState === "All" ? `${selectedCountry} Recipes` : `${selectedState} Specialities`}
-              <span className="ml-3 text-lg font-normal text-gray-400">({filteredRecipes.length})</span>
+              <span className="ml-3 text-lg font-normal text-gray-400">({recipes.length})</span>
             </h2>
           </div>
 
           {loading ? (
              <div className="text-center py-20 text-2xl">Loading Authentic Dishes...</div>
-          ) : filteredRecipes.length === 0 ? (
+          ) : recipes.length === 0 ? (
             <div className="text-center py-20 bg-white rounded-3xl shadow-inner">
               <p className="text-gray-400 text-xl">{t('noRecipesFound')}</p>
             </div>
           ) : (
             <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-8">
-              {filteredRecipes.map((recipe) => {
+              {recipes.map((recipe) => {
                 
                 const indianImages = [
                   "https://images.unsplash.com/photo-1618160702438-9b02ab6515c9?w=600&auto=format&fit=crop",
@@ -231,6 +256,18 @@ function Homepage() {
               })}
             </div>
           )}
+
+          {!loading && nextCursor && (
+            <div className="text-center mt-10">
+              <button
+                onClick={() => fetchRecipes(nextCursor)}
+                disabled={loadingMore}
+                className="px-8 py-3 rounded-full font-bold bg-orange-500 text-white shadow-md hover:bg-orange-600 transition-all disabled:opacity-50"
+              >
+                {loadingMore ? "Loading..." : "Load More"}
+              </button>
+            </div>
+          )}
         </div>
       </div>
 
@@ -21,7 +21,7 @@ export default function Profile() {
 
       try {
         // Fetch User Profile
-        const resProfile = await fetch(`${API_BASE_URL}/my-profile`);
+        const resProfile = await fetch(`${API_BASE_URL}/my-profile?fields=card,status`);
         if (resProfile.status === 401) {
             alert("Session expired. Please log in again.");
             navigate('/'); return;
@@ -31,7 +31,7 @@ export default function Profile() {
 
         // 🔥 Fetch Pending Recipes (ONLY IF ADMIN)
         if (dataProfile.user.role === 'admin') {
-            const resPending = await fetch(`${API_BASE_URL}/admin/pending-recipes`);
+            const resPending = await fetch(`${API_BASE_URL}/admin/pending-recipes?fields=card,author_id`);
             const dataPending = await resPending.json();
             setPendingRecipes(dataPending);
         }
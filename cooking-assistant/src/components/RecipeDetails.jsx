@@ -14,7 +14,6 @@ export default function RecipeDetails() {
   
   const isAutoVoiceMode = searchParams.get('voice') === 'true';
 
-  const [originalRecipe, setOriginalRecipe] = useState(null); 
   const [recipe, setRecipe] = useState(null); 
   
   const [loading, setLoading] = useState(true);
@@ -46,17 +45,19 @@ export default function RecipeDetails() {
   }, []);
 
   
+  // 🔥 Ek hi call: server canonical recipe + cached translation (?lang=) deta hai, ETag ke saath
   useEffect(() => {
     let isMounted = true;
     async function fetchRecipe() {
       try {
-        setLoading(true);
-        const response = await fetch(`${API_BASE_URL}/recipe/${id}`);
+        if (recipe) setTranslating(language !== 'en');
+        else setLoading(true);
+        const response = await fetch(`${API_BASE_URL}/recipe/${id}?lang=${language}`);
         if (!response.ok) throw new Error(`HTTP Error: ${response.status}`);
         const data = await response.json();
         
         if (isMounted) {
-            setOriginalRecipe(data);
+            setRecipe(data);
             setLikes(data.likes_count || 0);
             setComments(data.comments || []);
         }
@@ -75,51 +76,16 @@ export default function RecipeDetails() {
       } catch (error) {
         if(isMounted) setError(error.message);
       } finally {
-        if(isMounted) setLoading(false);
+        if(isMounted) {
+            setLoading(false);
+            setTranslating(false);
+        }
       }
     }
     if (id) fetchRecipe();
     
     return () => { isMounted = false; };
-  }, [id, user?.id]); 
-
-  useEffect(() => {
-    if (!originalRecipe) return;
-    
-    let isMounted = true;
-    
-    async function doTranslate() {
-        if (language === 'en') {
-            if(isMounted) {
-                setRecipe(originalRecipe);
-                setTranslating(false);
-            }
-            return;
-        }
-
-        if(isMounted) setTranslating(true); 
-        try {
-            const res = await fetch(`${API_BASE_URL}/translate-recipe`, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ recipe: originalRecipe, lang: language })
-            });
-            
-            if (!res.ok) throw new Error(`HTTP Error: ${res.status}`);
-            
-            const translatedData = await res.json();
-            if(isMounted) setRecipe(translatedData); 
-        } catch (e) {
-            console.error("Translation failed", e);
-            if(isMounted) setRecipe(originalRecipe); 
-        } finally {
-            if(isMounted) setTranslating(false); 
-        }
-    }
-    doTranslate();
-    
-    return () => { isMounted = false; };
-  }, [originalRecipe, language]);
+  }, [id, user?.id, language]); 
 
   // 3. Auto Voice Trigger
   useEffect(() => {
@@ -234,6 +200,43 @@ export default function RecipeDetails() {
     setCurrentText("");
   };
 
+  // SSE (/ask-ai/stream) padho, har sentence ko speak() queue me daalo. Kuch bola to true.
+  const streamAnswer = async (payload) => {
+    let spoken = false;
+    let speaking = Promise.resolve();
+    try {
+        const res = await fetch(`${API_BASE_URL}/ask-ai/stream`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: payload
+        });
+        if (!res.ok || !res.body) return false;
+        const reader = res.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = "";
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const events = buffer.split("\n\n");
+            buffer = events.pop();
+            for (const evt of events) {
+                if (evt.startsWith("event: done")) continue;
+                const dataLine = evt.split("\n").find(line => line.startsWith("data: "));
+                const text = dataLine && JSON.parse(dataLine.slice(6)).text;
+                if (!text) continue;
+                if (!spoken) setAiThinking(false);
+                spoken = true;
+                speaking = speaking.then(() => speak(text));
+            }
+        }
+    } catch (err) {
+        console.error("AI stream error", err);
+    }
+    await speaking;
+    return spoken;
+  };
+
   const handleAskAI = () => {
     stopReading(); 
     const recognition = new (window.webkitSpeechRecognition || window.SpeechRecognition)();
@@ -254,11 +257,14 @@ export default function RecipeDetails() {
         setCurrentText(`Thinking: "${question}"...`);
         setAiThinking(true);
 
+        const payload = JSON.stringify({ question: question, context: recipe, lang: language, mode: 'general' });
         try {
+            // 🔥 Pehla sentence aate hi bolna shuru; stream na chale to purana /ask-ai
+            if (await streamAnswer(payload)) return;
             const res = await fetch(`${API_BASE_URL}/ask-ai`, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ question: question, context: recipe, lang: language, mode: 'general' })
+                body: payload
             });
             const data = await res.json();
             setAiThinking(false);
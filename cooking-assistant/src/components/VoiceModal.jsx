@@ -254,7 +254,7 @@ export default function VoiceModal({ isOpen, onClose }) {
 
   const searchRecipes = async (query) => {
     try {
-      const response = await fetch(`${API_BASE_URL}/search?q=${encodeURIComponent(query)}`);
+      const response = await fetch(`${API_BASE_URL}/search?q=${encodeURIComponent(query)}&fields=id,title`);
       return await response.json();
     } catch (error) {
       return [];
@@ -265,15 +265,13 @@ export default function VoiceModal({ isOpen, onClose }) {
     const isEnglishOnly = /^[a-zA-Z\s]+$/.test(query);
     if (isEnglishOnly) return query.trim();
 
-    const dict = {
-        "वडापाव": "vada pav", "वडा पाव": "vada pav", "चिकन": "chicken", 
-        "पनीर": "paneer", "सूप": "soup", "डोसा": "dosa", "मसाला डोसा": "masala dosa",
-        "पाव भाजी": "pav bhaji", "मिसळ": "misal", "मछली": "fish", "अंडा": "egg",
-        "पोहा": "poha", "कांदा पोहा": "kanda poha", "पुरणपोळी": "puran poli"
-    };
-    
-    for (const [hiWord, enWord] of Object.entries(dict)) {
-        if (query.includes(hiWord)) return enWord;
+    // 🔥 Server ka local dish resolver (titles + Hindi/Marathi aliases + fuzzy match), ~1ms
+    try {
+        const res = await fetch(`${API_BASE_URL}/resolve-dish?q=${encodeURIComponent(query)}`);
+        const data = await res.json();
+        if (data.confident) return data.matches[0].name.toLowerCase();
+    } catch (err) {
+        console.error("Resolver failed", err);
     }
 
     // AI Timeout logic so it doesn't hang forever
@@ -346,14 +344,20 @@ export default function VoiceModal({ isOpen, onClose }) {
   const searchAndShow = async (query) => {
     setThinkingState(true); 
     let searchTerm = query.trim();
+    let results = [];
     
     if (language === 'hi' || language === 'mr') {
-        searchTerm = await safeTranslateSearch(query);
+        // 🔥 Server ka Hindi/Marathi title index seedha try karo, AI translation sirf fallback
+        results = await searchRecipes(searchTerm);
+        if (results.length === 0) {
+            searchTerm = await safeTranslateSearch(query);
+            results = await searchRecipes(searchTerm);
+        }
     } else {
         searchTerm = query.toLowerCase().replace(/[^a-z ]/g, '').trim();
+        results = await searchRecipes(searchTerm);
     }
 
-    const results = await searchRecipes(searchTerm);
     setThinkingState(false); 
     
     if (results.length > 0) {
@@ -0,0 +1,146 @@
+import os
+import json
+import time
+import atexit
+import threading
+from collections import OrderedDict
+from devanagari import tokens
+
+# Ek hi recipe pe baar baar poochhe jaane wale sawal ("kitni der ubaalein") Gemini tak nahi jaate
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 5000
+SAVE_EVERY = 50
+
+
+def normalize_question(question):
+    """Case, punctuation, whitespace, Devanagari spelling variants aur filler words ignore karo."""
+    return ' '.join(tokens(question or ''))
+
+
+def answer_key(context, lang, question):
+    """context server ka banaya hua hona chahiye (app._answer_context): id ho to DB wali recipe, warna sirf title."""
+    if context.get('id') is not None:
+        recipe = f"recipe:{context['id']}"
+    else:
+        recipe = f"title:{(context.get('title') or '').strip().lower()}"
+    return f"{recipe}|{lang}|{normalize_question(question)}"
+
+
+class TTLCache:
+    """
+    Thread-safe LRU with per-entry expiry and hit/miss/eviction counters. path diya ho to
+    entries har SAVE_EVERY writes pe (aur exit pe) JSON snapshot me save hoti hain.
+    """
+
+    def __init__(self, max_entries, ttl, path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self._items = OrderedDict()  # key -> (value, expires_at wall-clock)
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self.hits = self.misses = self.evictions = self.expired = 0
+        if path:
+            self._load()
+            atexit.register(self.save)
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[1] <= time.time():
+                del self._items[key]
+                self.expired += 1
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value):
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = (value, time.time() + self.ttl)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+                self.evictions += 1
+            self._dirty += 1
+            should_save = self.path and self._dirty >= SAVE_EVERY
+        if should_save:
+            self.save()
+
+    def discard(self, match):
+        with self._lock:
+            for key in [k for k in self._items if match(k)]:
+                del self._items[key]
+                self._dirty += 1
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, value, expires_at in saved:
+            if expires_at > now:
+                self._items[key] = (value, expires_at)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            snapshot = [[key, value, expires_at] for key, (value, expires_at) in self._items.items()]
+            self._dirty = 0
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp, 'w') as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"⚠️ Answer cache save failed: {e}")
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._items),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'expired': self.expired,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'persistent': bool(self.path),
+            }
+
+
+# ASK_AI_CACHE_FILE set ho (e.g. instance/ask_ai_cache.json) to restart ke baad bhi answers bache rehte hain
+_cache = TTLCache(
+    max_entries=int(os.getenv('ASK_AI_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)),
+    ttl=float(os.getenv('ASK_AI_CACHE_TTL_SECONDS', DEFAULT_TTL_SECONDS)),
+    path=os.getenv('ASK_AI_CACHE_FILE'),
+)
+
+
+def get_answer(context, lang, question):
+    return _cache.get(answer_key(context, lang, question))
+
+
+def put_answer(context, lang, question, answer):
+    if answer:
+        _cache.put(answer_key(context, lang, question), answer)
+
+
+def forget_recipe(recipe_id):
+    """Recipe delete hone pe uske answers hatao."""
+    prefix = f"recipe:{recipe_id}|"
+    _cache.discard(lambda key: key.startswith(prefix))
+
+
+def stats():
+    return _cache.stats()
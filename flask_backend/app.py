@@ -1,23 +1,38 @@
 import os
 import json
+import math
 import uuid
-import traceback
-import re
-from flask import Flask, jsonify, request, url_for
+import click
+from datetime import datetime, timedelta, timezone
+from flask import Flask, Response, jsonify, request, url_for, stream_with_context
 from flask_login import LoginManager, login_user, login_required, logout_user, current_user
 from flask_bcrypt import Bcrypt
 from flask_migrate import Migrate
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
-import google.generativeai as genai
 from dotenv import load_dotenv
-from models import db, User, Recipe, Like, Comment
+from models import (db, User, Recipe, RecipeCard, Like, Comment, serialize_recipes, reconcile_counters, catalog_version,
+                    catalog_stamp, parse_fields, fields_key, field_columns, project, rebuild_recipe_cards,
+                    RecipeChange, change_horizon, compact_changes)
+from pagination import parse_limit, keyset_page
+import llm
+from llm_providers import get_provider
+import translation_store
+import translation_memory
+import fragment_cache
+import facet_cache
+import answer_cache
+import translator
+import recipe_filters
+from dish_resolver import resolve_dish, is_confident
+from search_index import (init_search_index, rebuild_search_index, fts_enabled, search_recipe_ids as fts_search_ids,
+                          matching_ids as fts_matching_ids)
 
 load_dotenv()
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'secret-key-bhai-ka')
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///recipes.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///recipes.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 UPLOAD_FOLDER = os.path.join('static', 'uploads')
@@ -30,16 +45,10 @@ app.config['SESSION_COOKIE_HTTPONLY'] = True
 
 CORS(app, resources={r"/*": {
     "origins": ["http://localhost:5173", "http://127.0.0.1:5173"]
-}}, supports_credentials=True)
+}}, supports_credentials=True, expose_headers=['X-Next-Cursor', 'X-Total-Count', 'Link'])
 
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-model = None
-if GEMINI_API_KEY:
-    try:
-        genai.configure(api_key=GEMINI_API_KEY)
-        model = genai.GenerativeModel('gemini-flash-latest') 
-    except Exception as e:
-        print(f"❌ Gemini Connection Failed: {e}")
+# Gemini (GEMINI_API_KEY) ya offline benchmarks ke liye LLM_PROVIDER=stub; None ho to routes fallback dete hain
+provider = get_provider()
 
 db.init_app(app)
 migrate = Migrate(app, db)
@@ -55,96 +64,389 @@ def unauthorized():
 def load_user(user_id):
     return db.session.get(User, int(user_id))
 
-translation_cache = {}
+def _list_lang():
+    lang = request.args.get('lang', 'en')
+    return lang if lang == 'en' or lang in translator.SUPPORTED_LANGS else None
+
+def _fields():
+    # 🔥 ?fields=card,description — sirf ye keys bhejo (aur sirf inke columns load karo). None = invalid.
+    try:
+        return parse_fields(request.args.get('fields'))
+    except ValueError:
+        return None
+
+def _invalid_fields():
+    return jsonify({'error': 'Invalid fields', 'presets': ['card', 'full']}), 400
+
+def _list_filters(default_sort='newest'):
+    # 🔥 ?country=&state=&difficulty=&max_minutes=&author=&sort= — browser ko poora catalog nahi chahiye
+    try:
+        return recipe_filters.parse_filters(request.args), recipe_filters.parse_sort(request.args.get('sort'), default_sort)
+    except ValueError as e:
+        return None, str(e)
+
+def _set_next_page(response, endpoint, limit, next_cursor):
+    # Link me saare query params (lang, fields, filters, sort) wahi rehte hain, sirf cursor badalta hai
+    response.headers['X-Next-Cursor'] = next_cursor
+    args = {**request.args.to_dict(), 'limit': limit, 'cursor': next_cursor}
+    response.headers['Link'] = f'<{url_for(endpoint, **args)}>; rel="next"'
+
+def _card_fragments(rows, lang, fields):
+    # 🔥 Page ke har recipe ka pre-encoded JSON fragment (key me version + fieldset); sirf misses serialize/translate hote hain.
+    # rows: (id, version) rows. Returns (fragments, complete) — English fallback
+    # wale cards cache nahi hote aur us response pe ETag nahi lagta.
+    variant = fields_key(fields) if lang == 'en' else f'card:{fields_key(fields)}'
+    fragments = {row.id: fragment_cache.get(row.id, lang, variant, row.version) for row in rows}
+    missing = [recipe_id for recipe_id, fragment in fragments.items() if fragment is None]
+    untranslated = set()
+    if missing:
+        # Translation cache ka hash source fields pe hai, isliye non-English me wo columns bhi chahiye
+        load_fields = fields if lang == 'en' else parse_fields(','.join((*fields, *translation_store.TRANSLATED_FIELDS)))
+        loaded = db.session.query(*field_columns(load_fields)).filter(Recipe.id.in_(missing)).all()
+        versions = {row.id: row.version for row in loaded}
+        recipes_data = serialize_recipes(loaded, load_fields)
+        if lang != 'en':
+            recipes_data, untranslated = translator.translated_cards(provider, recipes_data, lang)
+        for data in recipes_data:
+            data = project(data, fields)
+            if data['id'] in untranslated:
+                fragments[data['id']] = fragment_cache.encode(data)
+            else:
+                fragments[data['id']] = fragment_cache.put(data['id'], lang, variant, versions[data['id']], data)
+    return [fragments[row.id] for row in rows if fragments.get(row.id)], not untranslated
+
+def _summary_fragments(cards, lang):
+    # recipe_card rows -> fragments; non-English me sirf title translate hota hai (translation memory se)
+    fragments = {card.id: fragment_cache.get(card.id, lang, 'summary', card.version) for card in cards}
+    missing = [card for card in cards if fragments[card.id] is None]
+    untranslated = set()
+    if missing:
+        cards_data = [card.to_dict() for card in missing]
+        if lang != 'en':
+            titles = translator.translate_batch(provider, cards_data, lang, fields=('title',))
+            untranslated = {data['id'] for data in cards_data if data['id'] not in titles}
+            cards_data = [{**data, **titles.get(data['id'], {})} for data in cards_data]
+        versions = {card.id: card.version for card in missing}
+        for data in cards_data:
+            if data['id'] in untranslated:
+                fragments[data['id']] = fragment_cache.encode(data)
+            else:
+                fragments[data['id']] = fragment_cache.put(data['id'], lang, 'summary', versions[data['id']], data)
+    return [fragments[card.id] for card in cards], not untranslated
+
+def _json_bytes(fragments, single=False):
+    # Fragments ke bytes (ya unke deflate blocks) seedhe jode jaate hain, jsonify/gzip dobara nahi
+    gzip = fragment_cache.wants_gzip(fragments, request.accept_encodings)
+    body = fragment_cache.object_body(fragments[0], gzip) if single else fragment_cache.array_body(fragments, gzip)
+    response = Response(body, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    if gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+def _with_validators(response, etag, last_modified):
+    # gzip aur plain alag representations hain, isliye strong ETag bhi alag
+    if response.headers.get('Content-Encoding') == 'gzip':
+        etag = f'{etag}-gz'
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def _not_modified(etag, last_modified):
+    # 🔥 If-None-Match / If-Modified-Since match ho to 304, kuch bhi load/serialize kiye bina
+    if request.if_none_match:
+        matched = [tag for tag in (etag, f'{etag}-gz') if request.if_none_match.contains(tag)]
+        fresh = bool(matched)
+    elif request.if_modified_since and last_modified:
+        fresh = last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= request.if_modified_since
+    else:
+        fresh = False
+    if not fresh:
+        return None
+    response = _with_validators(Response(status=304), etag, last_modified)
+    if request.if_none_match and matched[0] != etag:
+        response.set_etag(matched[0])
+    return response
+
+def _list_response(fragments, complete, etag, last_modified):
+    response = _json_bytes(fragments)
+    if complete:
+        return _with_validators(response, etag, last_modified)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 @app.route('/recipes')
 def recipes():
+    # 🔥 Keyset pagination: ?limit=&cursor= (next page ka cursor X-Next-Cursor header me)
+    limit = parse_limit(request.args.get('limit'))
+    cursor = request.args.get('cursor')
+    lang = _list_lang()
+    if lang is None:
+        return jsonify({'error': 'Unsupported language'}), 400
+    fields = _fields()
+    if fields is None:
+        return _invalid_fields()
+    filters, sort = _list_filters()
+    if filters is None:
+        return jsonify({'error': sort}), 400
+    version, last_modified = catalog_version()
+    etag = f'catalog-v{version}'
+    not_modified = _not_modified(etag, last_modified)
+    if not_modified:
+        return not_modified
     try:
-        recipes = Recipe.query.filter_by(status='approved').all()
-        return jsonify([r.to_dict() for r in recipes])
+        # Sirf (id, version[, sort key]): fragment cache hit wale recipes ka poora row load hi nahi hota
+        order_column, descending = recipe_filters.sort_column(Recipe, sort)
+        columns = [Recipe.id, Recipe.version] + ([order_column] if order_column is not None else [])
+        base_query = recipe_filters.apply_filters(
+            db.session.query(*columns).filter(Recipe.status == 'approved'), Recipe, filters)
+        try:
+            page, next_cursor = keyset_page(base_query, Recipe.id, limit, cursor, order_column, descending)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        response = _list_response(*_card_fragments(page, lang, fields), etag, last_modified)
+        if next_cursor:
+            _set_next_page(response, 'recipes', limit, next_cursor)
+        if request.args.get('total') in ('1', 'true'):
+            response.headers['X-Total-Count'] = str(base_query.count())
+        return response
     except Exception as e:
         return jsonify([])
 
+@app.route('/recipes/cards')
+def recipe_cards():
+    # 🔥 Home grid: recipe_card read model se, recipe table (ingredients/steps JSON, comments) ko chhue bina
+    limit = parse_limit(request.args.get('limit'))
+    cursor = request.args.get('cursor')
+    lang = _list_lang()
+    if lang is None:
+        return jsonify({'error': 'Unsupported language'}), 400
+    filters, sort = _list_filters()
+    if filters is None:
+        return jsonify({'error': sort}), 400
+    version, last_modified = catalog_version()
+    etag = f'catalog-v{version}'
+    not_modified = _not_modified(etag, last_modified)
+    if not_modified:
+        return not_modified
+    order_column, descending = recipe_filters.sort_column(RecipeCard, sort)
+    base_query = recipe_filters.apply_filters(RecipeCard.query.filter(RecipeCard.status == 'approved'), RecipeCard, filters)
+    try:
+        page, next_cursor = keyset_page(base_query, RecipeCard.id, limit, cursor, order_column, descending)
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    response = _list_response(*_summary_fragments(page, lang), etag, last_modified)
+    if next_cursor:
+        _set_next_page(response, 'recipe_cards', limit, next_cursor)
+    return response
+
+@app.route('/recipes/facets')
+def recipe_facets():
+    # 🔥 Sidebar ke counts (country/state/difficulty/cook_time); filters /recipes wale hi
+    # ?q= ho to counts sirf un recipes ke jo /search usi q pe deta (cache nahi; ETag /search jaisa)
+    filters, error = _list_filters()
+    if filters is None:
+        return jsonify({'error': error}), 400
+    query = request.args.get('q', '').strip()
+    if query:
+        version, titles_version, last_modified = catalog_stamp()
+        etag = f'catalog-v{version}-t{titles_version}'
+    else:
+        version, last_modified = catalog_version()
+        etag = f'catalog-v{version}'
+    not_modified = _not_modified(etag, last_modified)
+    if not_modified:
+        return not_modified
+    if not query:
+        return _with_validators(jsonify(facet_cache.facets(version, filters)), etag, last_modified)
+    if fts_enabled():
+        matches = fts_matching_ids(query, filters=filters)
+    else:
+        matches = db.select(Recipe.id).where(Recipe.title.ilike(f'%{query}%') | Recipe.description.ilike(f'%{query}%'))
+    return _with_validators(jsonify(facet_cache.compute(filters, matches)), etag, last_modified)
+
+@app.route('/recipes/changes')
+def recipe_changes():
+    # 🔥 Delta sync: ?since=<seq> ke baad badle recipes (approved) + hataye gaye ids; "seq" agli baar ka since
+    try:
+        since = int(request.args.get('since', 0))
+    except ValueError:
+        since = -1
+    if since < 0:
+        return jsonify({'error': 'Invalid since'}), 400
+    lang = _list_lang()
+    if lang is None:
+        return jsonify({'error': 'Unsupported language'}), 400
+    fields = _fields()
+    if fields is None:
+        return _invalid_fields()
+    limit = parse_limit(request.args.get('limit'), default=100, maximum=500)
+
+    latest, compacted = change_horizon()
+    if since < compacted or since > latest:
+        # Beech ke tombstones compact ho chuke (ya since kisi aur DB ka hai): client poora catalog dobara le
+        return jsonify({'error': 'Resync required', 'reset': True, 'seq': latest}), 410
+
+    rows = (db.session.query(RecipeChange.seq, RecipeChange.recipe_id.label('id'), RecipeChange.deleted,
+                             Recipe.status, Recipe.version)
+            .outerjoin(Recipe, Recipe.id == RecipeChange.recipe_id)
+            .filter(RecipeChange.seq > since)
+            .order_by(RecipeChange.seq).limit(limit + 1).all())
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    live = [row for row in rows if not row.deleted and row.status == 'approved']
+    removed = [row.id for row in rows if row.deleted or row.status != 'approved']
+    fragments, _ = _card_fragments(live, lang, fields) if live else ([], True)
+
+    head = json.dumps({'seq': rows[-1].seq if rows else since, 'has_more': has_more, 'removed': removed})
+    body = head[:-1].encode('utf-8') + b',"recipes":' + fragment_cache.array_body(fragments) + b'}'
+    response = Response(body, mimetype='application/json')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 @app.route('/search')
 def search_recipes():
-    query = request.args.get('q', '')
+    query = request.args.get('q', '').strip()
+    limit = parse_limit(request.args.get('limit'), default=20)
+    lang = _list_lang()
+    if lang is None:
+        return jsonify({'error': 'Unsupported language'}), 400
+    fields = _fields()
+    if fields is None:
+        return _invalid_fields()
+    filters, sort = _list_filters(default_sort='relevance')
+    if filters is None:
+        return jsonify({'error': sort}), 400
+    # hi/mr queries translated titles se bhi match hoti hain, isliye unke index ka version bhi ETag me
+    version, titles_version, last_modified = catalog_stamp()
+    etag = f'catalog-v{version}-t{titles_version}'
+    not_modified = _not_modified(etag, last_modified)
+    if not_modified:
+        return not_modified
     try:
-        recipes = Recipe.query.filter(
-            (Recipe.title.ilike(f'%{query}%') | Recipe.description.ilike(f'%{query}%')),
-            Recipe.status == 'approved'
-        ).limit(20).all()
-        return jsonify([r.to_dict() for r in recipes])
+        # 🔥 SQLite pe FTS5 + bm25 ranking (title > description > ingredients > steps); filters match ke saath SQL me
+        if query and fts_enabled():
+            ids = fts_search_ids(query, limit, filters=filters, sort=sort)
+            by_id = {row.id: row for row in db.session.query(Recipe.id, Recipe.version).filter(Recipe.id.in_(ids))} if ids else {}
+            rows = [by_id[i] for i in ids if i in by_id]
+        else:
+            base_query = recipe_filters.apply_filters(db.session.query(Recipe.id, Recipe.version).filter(
+                (Recipe.title.ilike(f'%{query}%') | Recipe.description.ilike(f'%{query}%')),
+                Recipe.status == 'approved'
+            ), Recipe, filters)
+            if sort != 'relevance':
+                base_query = base_query.order_by(*recipe_filters.order_clauses(Recipe, sort))
+            rows = base_query.limit(limit).all()
+        return _list_response(*_card_fragments(rows, lang, fields), etag, last_modified)
     except:
         return jsonify([])
 
 @app.route("/recipe/<int:recipe_id>")
 def get_recipe(recipe_id):
-    recipe = db.session.get(Recipe, recipe_id)
-    if recipe:
-        return jsonify(recipe.to_dict())
-    return jsonify({'error': 'Recipe not found'}), 404
+    # 🔥 ?lang=hi|mr: server khud canonical recipe load karke cached translation deta hai
+    lang = request.args.get('lang', 'en')
+    if lang != 'en' and lang not in translator.SUPPORTED_LANGS:
+        return jsonify({'error': 'Unsupported language'}), 400
+    fields = _fields()
+    if fields is None:
+        return _invalid_fields()
+    variant = fields_key(fields)
+    # Pehle sirf version (primary key lookup); client ke paas yahi version ho to 304
+    row = db.session.query(Recipe.version, Recipe.updated_at).filter(Recipe.id == recipe_id).first()
+    if row is None:
+        return jsonify({'error': 'Recipe not found'}), 404
+    not_modified = _not_modified(f'recipe-{recipe_id}-v{row.version}-{lang}', row.updated_at)
+    if not_modified:
+        return not_modified
+
+    version, updated_at = row.version, row.updated_at
+    fragment = fragment_cache.get(recipe_id, lang, variant, version)
+    if fragment is None:
+        # ?fields= list endpoints jaisa: sirf maange gaye columns load/serialize (comments query bhi tabhi).
+        # Non-English me translation hash ke source fields bhi chahiye, response phir bhi project() hota hai
+        load_fields = fields if lang == 'en' else parse_fields(','.join((*fields, *translation_store.TRANSLATED_FIELDS)))
+        recipe = db.session.query(*field_columns(load_fields), Recipe.updated_at).filter(Recipe.id == recipe_id).first()
+        if not recipe:
+            return jsonify({'error': 'Recipe not found'}), 404
+        recipe_data = serialize_recipes([recipe], load_fields)[0]
+        localized = recipe_data
+        if lang != 'en':
+            localized = translator.translated_recipe(provider, recipe_data, lang)
+        if lang != 'en' and localized is recipe_data:
+            # Translation abhi nahi mili (English fallback): na cache, na validators, taaki agli baar dobara try ho
+            response = jsonify(project(localized, fields))
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        version, updated_at = recipe.version, recipe.updated_at
+        fragment = fragment_cache.put(recipe_id, lang, variant, version, project(localized, fields))
+    return _with_validators(_json_bytes([fragment], single=True), f'recipe-{recipe_id}-v{version}-{lang}', updated_at)
 
 @app.route('/translate-recipe', methods=['POST'])
 def translate_recipe():
+    # Legacy endpoint; naye clients GET /recipe/<id>?lang= use karte hain
     data = request.json
     recipe_data = data.get('recipe')
     target_lang = data.get('lang') 
     
-    if target_lang == 'en' or not recipe_data or not model:
+    if target_lang == 'en' or not recipe_data:
+        return jsonify(recipe_data)
+
+    # Client ka bheja hua content cache me kabhi nahi jaata: known recipe ho to DB wala version translate hota hai
+    recipe_id = recipe_data.get('id')
+    recipe = db.session.get(Recipe, recipe_id) if isinstance(recipe_id, int) else None
+    if recipe:
+        return jsonify({**recipe_data, **translator.translated_recipe(provider, recipe.to_dict(), target_lang)})
+
+    if not provider:
         return jsonify(recipe_data)
-        
-    recipe_id = recipe_data.get('id', 'unknown')
-    cache_key = f"{recipe_id}_{target_lang}"
-    
-    if cache_key in translation_cache:
-        print(f"✅ Served from Cache: {cache_key}")
-        return jsonify(translation_cache[cache_key])
-        
-    lang_name = "Hindi" if target_lang == 'hi' else "Marathi"
-    
-    prompt = f"""
-    Translate the following JSON into {lang_name} (Devanagari script). 
-    Translate 'title', 'description', 'ingredients', and 'steps'.
-    CRITICAL: Output ONLY a valid JSON object. No markdown.
-    
-    {json.dumps({
-        'title': recipe_data.get('title', ''),
-        'description': recipe_data.get('description', ''),
-        'ingredients': recipe_data.get('ingredients', []),
-        'steps': recipe_data.get('steps', [])
-    }, ensure_ascii=False)}
-    """
-    
     try:
-        response = model.generate_content(prompt)
-        text = response.text.strip()
-        
-        match = re.search(r'\{.*\}', text, re.DOTALL)
-        if match:
-            clean_json = match.group(0)
-            translated_json = json.loads(clean_json)
-            final_recipe = {**recipe_data, **translated_json}
-            translation_cache[cache_key] = final_recipe
-            return jsonify(final_recipe)
-        else:
-            raise ValueError("No JSON format found in AI response")
-            
+        # Anjaan recipe: translate karo par shared translation memory me kuch mat likho (poisoning)
+        return jsonify({**recipe_data, **translator.translate_fields(provider, recipe_data, target_lang, remember=False)})
     except Exception as e:
         print(f"❌ Translation Failed: {e}")
         return jsonify(recipe_data) 
 
+@app.route('/resolve-dish')
+def resolve_dish_route():
+    query = request.args.get('q', '')
+    matches = resolve_dish(query, limit=parse_limit(request.args.get('limit'), default=5, maximum=20))
+    return jsonify({'query': query, 'matches': matches, 'confident': is_confident(matches)})
+
 # --- ASK AI ROUTE ---
+def _answer_context(context):
+    # 🔥 Prompt aur cache key dono server ke data se: id wali recipe ka title DB se aata hai, client ka nahi,
+    # warna koi bhi kisi recipe id ki key me apne title wala answer likh deta
+    context = context if isinstance(context, dict) else {}
+    recipe_id = context.get('id')
+    if isinstance(recipe_id, int):
+        row = db.session.query(Recipe.id, Recipe.title).filter(Recipe.id == recipe_id).first()
+        if row:
+            return {'id': row.id, 'title': row.title}
+    return {'title': str(context.get('title') or '')}
+
+def _answer_prompt(question, context, target_lang):
+    lang_str = "Hindi" if target_lang == 'hi' else "Marathi" if target_lang == 'mr' else "English"
+    return f"Answer briefly in {lang_str}: {question}. Context: {context.get('title','')}"
+
 @app.route('/ask-ai', methods=['POST'])
 def ask_ai():
     data = request.json
     question = data.get('question', '')
     mode = data.get('mode', 'general')
+
+    if mode == 'search':
+        # 🔥 Local resolver pehle; Gemini sirf tab jab match confident na ho
+        matches = resolve_dish(question, limit=1)
+        if is_confident(matches):
+            return jsonify({'answer': matches[0]['name'].lower()})
     
-    if not model:
+    if not provider:
         return jsonify({'answer': question}), 200 
 
     try:
-        context = data.get('context', {})
+        context = _answer_context(data.get('context'))
         target_lang = data.get('lang', 'en')
         
         if mode == 'search':
@@ -154,19 +456,59 @@ def ask_ai():
             DO NOT output sentences. Just the English word.
             Text: "{question}"
             """
-            response = model.generate_content(prompt)
-            ans = response.text.replace('.', '').replace('"', '').replace("'", '').strip().lower()
+            ans = llm.generate_text(provider, prompt).replace('.', '').replace('"', '').replace("'", '').strip().lower()
             return jsonify({'answer': ans})
         else:
-            lang_str = "Hindi" if target_lang == 'hi' else "Marathi" if target_lang == 'mr' else "English"
-            prompt = f"Answer briefly in {lang_str}: {question}. Context: {context.get('title','')}"
-            response = model.generate_content(prompt)
-            return jsonify({'answer': response.text.replace('*', '').strip()})
+            cached = answer_cache.get_answer(context, target_lang, question)
+            if cached:
+                return jsonify({'answer': cached})
+            answer = llm.generate_text(provider, _answer_prompt(question, context, target_lang)).replace('*', '').strip()
+            answer_cache.put_answer(context, target_lang, question, answer)
+            return jsonify({'answer': answer})
             
+    except llm.LLMRateLimited as e:
+        # Quota khatam: client ko fallback answer bhi milta hai aur kab dobara try kare wo bhi
+        return jsonify({'answer': question, 'error': 'rate_limited'}), 429, {'Retry-After': str(math.ceil(e.retry_after))}
     except Exception as e:
         print(f"AI Error: {e}")
         return jsonify({'answer': question}), 200 
 
+def _sse(payload, event=None):
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+@app.route('/ask-ai/stream', methods=['POST'])
+def ask_ai_stream():
+    # 🔥 SSE: har poora sentence aate hi bhejo, client pehle sentence pe hi bolna shuru kar de
+    data = request.json
+    question = data.get('question', '')
+    context = _answer_context(data.get('context'))
+    target_lang = data.get('lang', 'en')
+
+    def events():
+        sent = []
+        cached = answer_cache.get_answer(context, target_lang, question)
+        try:
+            if cached:
+                pieces = llm.sentence_chunks([cached])
+            elif provider:
+                pieces = llm.sentence_chunks(llm.stream_text(provider, _answer_prompt(question, context, target_lang)))
+            else:
+                pieces = []
+            for sentence in pieces:
+                sent.append(sentence)
+                yield _sse({'text': sentence})
+            if sent and not cached:
+                answer_cache.put_answer(context, target_lang, question, ' '.join(sent))
+        except Exception as e:
+            print(f"AI Error: {e}")
+        if not sent:
+            yield _sse({'text': question})
+        yield _sse({}, event='done')
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 # --- AUTH & OTHER ROUTES ---
 @app.route('/signup', methods=['POST'])
 def signup():
@@ -197,8 +539,11 @@ def logout():
 @app.route('/my-profile', methods=['GET'])
 @login_required
 def my_profile():
-    my_recipes = Recipe.query.filter_by(author_id=current_user.id).all()
-    return jsonify({'user': {'name': current_user.name, 'email': current_user.email, 'id': current_user.id, 'role': current_user.role}, 'stats': {'total_recipes': len(my_recipes)}, 'recipes': [r.to_dict() for r in my_recipes]})
+    fields = _fields()
+    if fields is None:
+        return _invalid_fields()
+    my_recipes = db.session.query(*field_columns(fields)).filter(Recipe.author_id == current_user.id).all()
+    return jsonify({'user': {'name': current_user.name, 'email': current_user.email, 'id': current_user.id, 'role': current_user.role}, 'stats': {'total_recipes': len(my_recipes)}, 'recipes': serialize_recipes(my_recipes, fields)})
 
 @app.route('/recipes/upload', methods=['POST'])
 @login_required
@@ -223,17 +568,23 @@ def upload_recipe():
         new_recipe = Recipe(title=title, description=description, image_url=image_url, ready_in_minutes=int(cook_time), servings=int(servings), difficulty="Medium", ingredients=ingredients, steps=steps, author_id=current_user.id, status=status)
         db.session.add(new_recipe)
         db.session.commit()
+        if status == 'approved':
+            translator.queue_translation(app, provider, new_recipe.id)
         return jsonify({'message': 'Recipe submitted!', 'recipe': new_recipe.to_dict()}), 201
     except Exception as e: return jsonify({'error': 'Upload failed'}), 500
 
 @app.route('/recipe/<int:recipe_id>/like', methods=['POST'])
 @login_required
 def toggle_like(recipe_id):
+    recipe = db.session.get(Recipe, recipe_id)
+    if not recipe: return jsonify({'error': 'Recipe not found'}), 404
     existing = Like.query.filter_by(user_id=current_user.id, recipe_id=recipe_id).first()
     if existing: db.session.delete(existing)
     else: db.session.add(Like(user_id=current_user.id, recipe_id=recipe_id))
+    # 🔥 Counter same transaction me (atomic SQL increment, no COUNT(*))
+    recipe.likes_count = Recipe.likes_count + (-1 if existing else 1)
     db.session.commit()
-    return jsonify({'likes_count': Like.query.filter_by(recipe_id=recipe_id).count()})
+    return jsonify({'likes_count': recipe.likes_count})
 
 @app.route('/recipe/<int:recipe_id>/is_liked')
 @login_required
@@ -243,16 +594,22 @@ def is_liked(recipe_id):
 @app.route('/recipe/<int:recipe_id>/comment', methods=['POST'])
 @login_required
 def add_comment(recipe_id):
+    recipe = db.session.get(Recipe, recipe_id)
+    if not recipe: return jsonify({'error': 'Recipe not found'}), 404
     new_comment = Comment(text=request.json.get('text'), user_id=current_user.id, recipe_id=recipe_id)
     db.session.add(new_comment)
+    recipe.comments_count = Recipe.comments_count + 1
     db.session.commit()
-    return jsonify({'comment': {'id': new_comment.id, 'text': new_comment.text, 'user': current_user.name, 'date': new_comment.timestamp.strftime('%Y-%m-%d')}})
+    return jsonify({'comment': new_comment.to_dict()})
 
 @app.route('/admin/pending-recipes')
 @login_required
 def admin_pending_recipes():
     if current_user.role != 'admin': return jsonify({'error': 'Forbidden'}), 403
-    return jsonify([r.to_dict() for r in Recipe.query.filter_by(status='pending').all()])
+    fields = _fields()
+    if fields is None:
+        return _invalid_fields()
+    return jsonify(serialize_recipes(db.session.query(*field_columns(fields)).filter(Recipe.status == 'pending').all(), fields))
 
 @app.route('/admin/recipe/<int:recipe_id>/status', methods=['POST'])
 @login_required
@@ -263,6 +620,9 @@ def admin_update_status(recipe_id):
     if recipe and new_status in ['approved', 'rejected']:
         recipe.status = new_status
         db.session.commit()
+        # 🔥 Approved recipe ka hi/mr translation pehle se bana do (first visitor wait na kare)
+        if new_status == 'approved':
+            translator.queue_translation(app, provider, recipe_id)
         return jsonify({'message': f'Recipe {new_status}'})
     return jsonify({'error': 'Invalid request'}), 400
 
@@ -272,6 +632,11 @@ def admin_delete_recipe(recipe_id):
     if current_user.role != 'admin': return jsonify({'error': 'Unauthorized'}), 403
     recipe = db.session.get(Recipe, recipe_id)
     if recipe:
+        # Likes/comments bhi hatao warna orphan rows counters reconcile ko bigaad dengi
+        Like.query.filter_by(recipe_id=recipe_id).delete()
+        Comment.query.filter_by(recipe_id=recipe_id).delete()
+        translation_store.forget_recipe(recipe_id)
+        answer_cache.forget_recipe(recipe_id)
         db.session.delete(recipe)
         db.session.commit()
         return jsonify({'message': 'Recipe deleted successfully!'})
@@ -293,8 +658,50 @@ def admin_update_image(recipe_id):
             return jsonify({'message': 'Updated!', 'image_url': recipe.image_url})
     return jsonify({'error': 'Failed'}), 400
 
+@app.route('/admin/metrics')
+@login_required
+def admin_metrics():
+    if current_user.role != 'admin': return jsonify({'error': 'Forbidden'}), 403
+    return jsonify({
+        'translation_cache': translation_store.stats(),
+        'translation_memory': translation_memory.stats(),
+        'answer_cache': answer_cache.stats(),
+        'fragment_cache': fragment_cache.stats(),
+        'facet_cache': facet_cache.stats(),
+        'llm': llm.stats(),
+    })
+
+@app.cli.command('reconcile-counters')
+def reconcile_counters_command():
+    """Backfill/repair Recipe.likes_count and comments_count."""
+    fixed = reconcile_counters()
+    print(f"✅ Reconciled counters for {fixed} recipes")
+
+@app.cli.command('rebuild-recipe-cards')
+def rebuild_recipe_cards_command():
+    """Rebuild the recipe_card read model from the recipe table."""
+    written = rebuild_recipe_cards(db.session.connection())
+    db.session.commit()
+    print(f"✅ Rebuilt {written} recipe cards")
+
+@app.cli.command('compact-recipe-changes')
+@click.option('--days', default=30, show_default=True, help='Keep tombstones newer than this many days.')
+def compact_recipe_changes_command(days):
+    """Delete old delete-tombstones from the recipe change feed."""
+    removed = compact_changes(datetime.utcnow() - timedelta(days=days))
+    print(f"✅ Compacted {removed} tombstones (clients older than that resync fully)")
+
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """Rebuild the FTS5 recipe search index from scratch."""
+    if not fts_enabled():
+        print("⚠️ FTS5 search index not available on this database")
+        return
+    print(f"✅ Indexed {rebuild_search_index()} recipes")
+
 with app.app_context():
     db.create_all()
+    init_search_index()
     if not User.query.filter_by(email="admin@cookbuddy.com").first():
         admin = User(name="Super Admin", email="admin@cookbuddy.com", role="admin")
         admin.set_password("admin123")
@@ -0,0 +1,144 @@
+import re
+import unicodedata
+
+# Voice transcripts aur Gemini output me ek hi shabd kai spellings me aata hai:
+# "पनीर"/"पनिर", "हिंदी"/"हिन्दी", "पँजाबी"/"पंजाबी", "ज़ीरा"/"जीरा", "पोळी"/"पोली".
+# Index aur query dono isi normalization se guzarte hain, to sab ek token pe milte hain.
+
+_DEVANAGARI_RE = re.compile('[ऀ-ॿ]')
+
+# Python ka \w matras (Mc/Mn) pe word tod deta hai ("पनीर" -> "पन", "र"), isliye
+# poora Devanagari block (danda । ॥ chhod ke) word character maana jaata hai
+WORD_RE = re.compile('[\\wऀ-ॣ०-ॿ]+')
+
+NUKTA = '़'
+VIRAMA = '्'
+ANUSVARA = 'ं'
+
+_CHAR_MAP = str.maketrans({
+    'ँ': ANUSVARA,   # chandrabindu -> anusvara
+    'ी': 'ि',   # long i matra -> short i matra
+    'ू': 'ु',   # long u matra -> short u matra
+    'ई': 'इ',   # ई -> इ
+    'ऊ': 'उ',   # ऊ -> उ
+    'ॅ': 'े',   # candra e matra -> e matra
+    'ॉ': 'ो',   # candra o matra -> o matra
+    'ऑ': 'ओ',   # ऑ -> ओ
+    'ळ': 'ल',   # ळ -> ल (Marathi)
+    '‌': None,       # ZWNJ
+    '‍': None,       # ZWJ
+})
+
+# Nasal consonant + virama before another consonant == anusvara (पञ्जाब -> पंजाब)
+_NASAL_CLUSTER_RE = re.compile('[ङञणनम]' + VIRAMA + '(?=[क-ह])')
+
+
+def has_devanagari(text):
+    return bool(text) and _DEVANAGARI_RE.search(text) is not None
+
+
+def normalize(text):
+    """Devanagari spelling variants ko ek canonical form me lao (Latin text sirf lowercase hota hai)."""
+    if not text:
+        return ''
+    # NFD se precomposed nukta letters (क़ ज़ ड़) base + nukta me toot jaate hain
+    text = unicodedata.normalize('NFD', text.lower()).replace(NUKTA, '')
+    text = _NASAL_CLUSTER_RE.sub(ANUSVARA, text)
+    text = text.translate(_CHAR_MAP)
+    return unicodedata.normalize('NFC', text)
+
+
+# Voice queries ke filler words (Hindi + Marathi), search me inka koi matlab nahi
+STOPWORDS = {
+    normalize(word) for word in (
+        'है', 'हैं', 'था', 'मुझे', 'मेरे', 'लिए', 'का', 'की', 'के', 'को', 'में', 'और', 'कैसे', 'कैसा',
+        'बनाना', 'बनाएं', 'बनाओ', 'बताओ', 'बताइए', 'दिखाओ', 'चाहिए', 'रेसिपी', 'विधि', 'एक', 'कोई',
+        'मला', 'आहे', 'करायचा', 'करायची', 'कसा', 'कशी', 'कसे', 'सांगा', 'दाखवा', 'पाहिजे', 'चा', 'ची', 'चे',
+        'please', 'recipe', 'show', 'me', 'how', 'to', 'make', 'the', 'a', 'of', 'for', 'want', 'i',
+    )
+}
+
+
+def tokens(text, drop_stopwords=True):
+    words = WORD_RE.findall(normalize(text))
+    if drop_stopwords:
+        kept = [w for w in words if w not in STOPWORDS]
+        # Agar sab filler hi tha to original words rakho
+        return kept or words
+    return words
+
+
+_CONSONANTS = {
+    'क': 'k', 'ख': 'kh', 'ग': 'g', 'घ': 'gh', 'ङ': 'n',
+    'च': 'ch', 'छ': 'chh', 'ज': 'j', 'झ': 'jh', 'ञ': 'n',
+    'ट': 't', 'ठ': 'th', 'ड': 'd', 'ढ': 'dh', 'ण': 'n',
+    'त': 't', 'थ': 'th', 'द': 'd', 'ध': 'dh', 'न': 'n',
+    'प': 'p', 'फ': 'ph', 'ब': 'b', 'भ': 'bh', 'म': 'm',
+    'य': 'y', 'र': 'r', 'ल': 'l', 'ळ': 'l', 'व': 'v',
+    'श': 'sh', 'ष': 'sh', 'स': 's', 'ह': 'h',
+}
+_VOWELS = {
+    'अ': 'a', 'आ': 'aa', 'इ': 'i', 'ई': 'ii', 'उ': 'u', 'ऊ': 'uu', 'ऋ': 'ri',
+    'ए': 'e', 'ऐ': 'ai', 'ओ': 'o', 'औ': 'au', 'ऑ': 'o',
+}
+_MATRAS = {
+    'ा': 'aa', 'ि': 'i', 'ी': 'ii', 'ु': 'u', 'ू': 'uu', 'ृ': 'ri',
+    'े': 'e', 'ै': 'ai', 'ो': 'o', 'ौ': 'au', 'ॅ': 'e', 'ॉ': 'o',
+}
+_SIGNS = {ANUSVARA: 'n', 'ँ': 'n', 'ः': 'h'}
+
+
+def to_latin(text):
+    """
+    Rough Devanagari -> Latin transliteration ("पनीर" -> "paniir", "वडा पाव" -> "vadaa paav").
+    Hindi schwa deletion: word ke aakhri consonant ka inherent 'a' nahi bola jaata.
+    """
+    text = unicodedata.normalize('NFD', text).replace(NUKTA, '')
+    out = []
+    for word in WORD_RE.findall(text):
+        latin = ''
+        for i, ch in enumerate(word):
+            nxt = word[i + 1] if i + 1 < len(word) else ''
+            if ch in _CONSONANTS:
+                latin += _CONSONANTS[ch]
+                if nxt and nxt not in _MATRAS and nxt != VIRAMA:
+                    latin += 'a'
+            elif ch in _MATRAS:
+                latin += _MATRAS[ch]
+            elif ch in _VOWELS:
+                latin += _VOWELS[ch]
+            elif ch in _SIGNS:
+                latin += _SIGNS[ch]
+            elif ch != VIRAMA:
+                latin += ch
+        out.append(latin)
+    return ' '.join(out)
+
+
+# Romanized Hindi ki spellings bahut alag hoti hain (paneer/panir, bhaji/bhajee, kheer/khir),
+# to match karne se pehle dono taraf ek loose phonetic key banti hai
+_PHONETIC_RULES = [
+    (re.compile(r'(ee|ii|ey|y\b)'), 'i'),
+    (re.compile(r'(oo|uu|ou)'), 'u'),
+    (re.compile(r'aa'), 'a'),
+    (re.compile(r'ph'), 'f'),
+    (re.compile(r'(ck|q|c(?!h))'), 'k'),
+    (re.compile(r'w'), 'v'),
+    (re.compile(r'z'), 'j'),
+    (re.compile(r'sh'), 's'),
+    (re.compile(r'x'), 'ks'),
+    (re.compile(r'([a-z])\1+'), r'\1'),   # doubled letters: butter->buter, chh->ch
+    (re.compile(r'([a-z])h'), r'\1'),     # aspiration drop: bh->b, kh->k, ch->c
+    (re.compile(r'u'), 'a'),              # schwa often written as u (mutton/matan)
+]
+
+
+def phonetic_key(text):
+    """Kisi bhi script ke dish name ko loose Latin key me badlo (matching ke liye)."""
+    if has_devanagari(text):
+        text = to_latin(text)
+    key = ' '.join(tokens(text))
+    key = re.sub(r'[^a-z ]', '', key)
+    for pattern, replacement in _PHONETIC_RULES:
+        key = pattern.sub(replacement, key)
+    return key.strip()
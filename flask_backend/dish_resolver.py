@@ -0,0 +1,141 @@
+import threading
+from collections import Counter
+from flask import current_app
+from sqlalchemy import text
+from models import db, Recipe, catalog_stamp
+from devanagari import phonetic_key
+import search_index
+
+# Is score se upar ka top match "confident" hai; neeche wale pe hi Gemini fallback chalta hai
+CONFIDENT_SCORE = 0.6
+
+# Common spoken names jo shayad kisi title me na hon (pehle VoiceModal.jsx me hard-coded the)
+ALIASES = {
+    "वडापाव": "vada pav", "वडा पाव": "vada pav", "चिकन": "chicken",
+    "पनीर": "paneer", "सूप": "soup", "डोसा": "dosa", "मसाला डोसा": "masala dosa",
+    "पाव भाजी": "pav bhaji", "मिसळ": "misal", "मछली": "fish", "अंडा": "egg",
+    "पोहा": "poha", "कांदा पोहा": "kanda poha", "पुरणपोळी": "puran poli",
+}
+
+
+def _trigrams(key):
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _Dictionary:
+    """Immutable snapshot: (spoken form -> English dish name) entries + trigram postings."""
+
+    def __init__(self, entries):
+        self.names = []      # English dish name (jo /search ko bheja jaata hai)
+        self.recipe_ids = []
+        self.sizes = []
+        self.postings = {}
+        seen = set()
+        for spoken, name, recipe_id in entries:
+            key = phonetic_key(spoken)
+            if not key or (key, name) in seen:
+                continue
+            seen.add((key, name))
+            grams = _trigrams(key)
+            idx = len(self.names)
+            self.names.append(name)
+            self.recipe_ids.append(recipe_id)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(idx)
+
+    def lookup(self, query, limit):
+        grams = _trigrams(phonetic_key(query))
+        if len(grams) < 2:
+            return []
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+
+        best = {}
+        for idx, overlap in shared.items():
+            # Dice (poora naam kitna milta hai) + containment (ek naam dusre ke andar hai ya nahi,
+            # e.g. "मुझे पनीर बनाना है" me "paneer")
+            dice = 2 * overlap / (len(grams) + self.sizes[idx])
+            containment = max(overlap / len(grams), overlap / self.sizes[idx])
+            score = round(0.5 * dice + 0.5 * containment, 3)
+            # Title aur alias ek hi naam de sakte hain; recipe wali entry ko prefer karo
+            candidate = (score, self.recipe_ids[idx] is not None, self.names[idx], self.recipe_ids[idx])
+            name_key = self.names[idx].lower()
+            if candidate[:2] > best.get(name_key, (0, False))[:2]:
+                best[name_key] = candidate
+
+        ranked = sorted(best.values(), reverse=True)[:limit]
+        return [{'name': name, 'recipe_id': recipe_id, 'score': score} for score, _, name, recipe_id in ranked]
+
+
+_lock = threading.Lock()
+# stamp: kis titles_version tak ka dictionary hai. DB me hai, isliye dusre process ke writes bhi dikhte hain.
+# builder: chal raha background rebuild (ek hi waqt pe ek)
+_state = {'dictionary': None, 'stamp': None, 'builder': None}
+
+
+def _load_entries():
+    rows = db.session.query(Recipe.id, Recipe.title).filter(Recipe.status == 'approved').all()
+    titles = {recipe_id: title for recipe_id, title in rows if title}
+    entries = [(title, title, recipe_id) for recipe_id, title in titles.items()]
+
+    if search_index.fts_enabled():
+        local = db.session.execute(text(f"SELECT rowid, title FROM {search_index.LOCAL_FTS_TABLE}"))
+        for rowid, local_title in local:
+            recipe_id = rowid // 4
+            if recipe_id in titles:
+                entries.append((local_title, titles[recipe_id], recipe_id))
+
+    entries.extend((spoken, name, None) for spoken, name in ALIASES.items())
+    return entries
+
+
+def _build():
+    # Stamp pehle padho: beech me title badla to agla resolve ek baar aur rebuild karega, purana nahi dikhega
+    stamp = catalog_stamp()[1]
+    return _Dictionary(_load_entries()), stamp
+
+
+def _rebuild_in_background(app):
+    try:
+        with app.app_context():
+            dictionary, stamp = _build()
+        _state['dictionary'], _state['stamp'] = dictionary, stamp
+    finally:
+        _state['builder'] = None
+
+
+def _dictionary():
+    """
+    Har resolve pe ek primary key lookup. Titles badle hon to naya copy background thread me banta hai
+    aur tab tak requests purane copy se jawab dete hain (100k titles pe rebuild ~1s hai).
+    """
+    stamp = catalog_stamp()[1]
+    if _state['stamp'] == stamp:
+        return _state['dictionary']
+    with _lock:
+        if _state['dictionary'] is None:
+            # Pehli baar purana copy hai hi nahi, yahin banao
+            _state['dictionary'], _state['stamp'] = _build()
+        elif _state['builder'] is None and _state['stamp'] != stamp:
+            builder = threading.Thread(target=_rebuild_in_background, args=(current_app._get_current_object(),),
+                                       name='dish-dictionary', daemon=True)
+            _state['builder'] = builder
+            builder.start()
+    return _state['dictionary']
+
+
+def resolve_dish(query, limit=5):
+    """
+    Free-text transcript (English, romanized Hindi ya Devanagari) se best English
+    dish names nikalo, bina LLM ke. Returns [{'name', 'recipe_id', 'score'}, ...].
+    """
+    if not query or not query.strip():
+        return []
+    return _dictionary().lookup(query, limit)
+
+
+def is_confident(matches):
+    return bool(matches) and matches[0]['score'] >= CONFIDENT_SCORE
@@ -0,0 +1,196 @@
+import threading
+from collections import Counter, OrderedDict
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+from models import db, Recipe, RecipeCard
+import recipe_filters
+
+# 🔥 Filter sidebar ke counts. Bina filter wale counts memory me rehte hain aur har approved
+# recipe ke insert/update/delete pe O(1) delta se update hote hain (commit ke baad, rollback pe nahi).
+# Har row event catalog version +1 karta hai; apne deltas ke baad bhi version match na ho
+# (dusre process ne likha, bulk update) to ek baar grouped queries se dobara ginte hain.
+
+FACETS = ('country', 'state', 'difficulty', 'cook_time')
+
+# (upper bound minutes, bucket) — max_minutes filter ke hisaab se "≤ 15", "≤ 30", ...
+COOK_TIME_BUCKETS = ((15, 'under_15'), (30, 'under_30'), (60, 'under_60'))
+OVER_BUCKET = 'over_60'
+FILTERED_CACHE_ENTRIES = 256
+
+# facet -> jo filter us facet ko khud narrow karta hai (disjunctive faceting me wahi filter hatta hai)
+_OWN_FILTER = {'country': 'country', 'state': 'state', 'difficulty': 'difficulty', 'cook_time': 'ready_in_minutes'}
+
+
+def cook_time_bucket(minutes):
+    if minutes is None:
+        return None
+    for limit, bucket in COOK_TIME_BUCKETS:
+        if minutes <= limit:
+            return bucket
+    return OVER_BUCKET
+
+
+def _bucket_expression(column):
+    return db.case(*((column <= limit, bucket) for limit, bucket in COOK_TIME_BUCKETS),
+                   (column.isnot(None), OVER_BUCKET), else_=None)
+
+
+def facet_column(facet):
+    if facet == 'cook_time':
+        return _bucket_expression(RecipeCard.ready_in_minutes)
+    return getattr(RecipeCard, facet)
+
+
+def compute(filters=None, matches=None):
+    """
+    Grouped queries (recipe_card pe). Har facet ke counts us facet ke apne filter ke bina.
+    matches: recipe ids ka subquery (search_index.matching_ids) — ?q= wale counts sirf unhi recipes pe.
+    """
+    filters = filters or {}
+
+    def base(exclude=None):
+        query = db.session.query(RecipeCard.id).filter(RecipeCard.status == 'approved')
+        if matches is not None:
+            query = query.filter(RecipeCard.id.in_(matches))
+        return recipe_filters.apply_filters(query, RecipeCard,
+                                            {k: v for k, v in filters.items() if k != exclude})
+
+    result = {'total': base().count()}
+    for facet in FACETS:
+        column = facet_column(facet).label('value')
+        query = base(_OWN_FILTER[facet]).with_entities(column, db.func.count()).group_by(column)
+        result[facet] = {value: count for value, count in query if value is not None}
+    return result
+
+
+class _Totals:
+    """Bina filter wale counts: har facet ka Counter + total, aur kis catalog version tak ke hain."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = None
+        self.total = 0
+        self.counts = {facet: Counter() for facet in FACETS}
+        self.rebuilds = self.deltas = 0
+
+    def load(self, version, computed):
+        with self._lock:
+            self.version = version
+            self.total = computed['total']
+            self.counts = {facet: Counter(computed[facet]) for facet in FACETS}
+            self.rebuilds += 1
+
+    def apply(self, deltas, events):
+        with self._lock:
+            if self.version is None:
+                return
+            for sign, values in deltas:
+                self.total += sign
+                for facet, value in zip(FACETS, values):
+                    if value is not None:
+                        self.counts[facet][value] += sign
+            self.version += events
+            self.deltas += len(deltas)
+
+    def snapshot(self, version):
+        with self._lock:
+            if self.version != version:
+                return None
+            return {'total': self.total,
+                    **{facet: {k: v for k, v in counts.items() if v > 0} for facet, counts in self.counts.items()}}
+
+
+_totals = _Totals()
+_filtered = OrderedDict()  # (version, filters) -> facets
+_filtered_lock = threading.Lock()
+
+
+def facets(version, filters=None):
+    """
+    version: isi request ki transaction me padha catalog_version() (compute bhi usi snapshot ko dekhta hai).
+    Bina filter: memory se; filter ke saath: grouped queries, us version tak cached.
+    """
+    if not filters:
+        cached = _totals.snapshot(version)
+        if cached is None:
+            _totals.load(version, compute())
+            cached = _totals.snapshot(version)
+        return cached
+
+    key = (version, tuple(sorted(filters.items())))
+    with _filtered_lock:
+        cached = _filtered.get(key)
+        if cached is not None:
+            _filtered.move_to_end(key)
+            return cached
+    computed = compute(filters)
+    with _filtered_lock:
+        _filtered[key] = computed
+        for stale in [k for k in _filtered if k[0] != version]:
+            del _filtered[stale]
+        while len(_filtered) > FILTERED_CACHE_ENTRIES:
+            _filtered.popitem(last=False)
+    return computed
+
+
+# --- Incremental maintenance ---
+
+def _values(status, country, state, difficulty, minutes):
+    return (country, state, difficulty, cook_time_bucket(minutes)) if status == 'approved' else None
+
+
+def _old_value(target, attr):
+    history = inspect(target).attrs[attr].history
+    return history.deleted[0] if history.deleted else getattr(target, attr)
+
+
+def _record(target, old, new):
+    session = object_session(target)
+    if session is None:
+        return
+    pending = session.info.setdefault('facet_deltas', {'deltas': [], 'events': 0})
+    pending['events'] += 1
+    if old != new:
+        if old is not None:
+            pending['deltas'].append((-1, old))
+        if new is not None:
+            pending['deltas'].append((1, new))
+
+
+def _current(target):
+    return _values(target.status, target.country, target.state, target.difficulty, target.ready_in_minutes)
+
+
+@event.listens_for(Recipe, 'after_insert')
+def _recipe_inserted(mapper, connection, target):
+    _record(target, None, _current(target))
+
+
+@event.listens_for(Recipe, 'after_update')
+def _recipe_updated(mapper, connection, target):
+    old = _values(*(_old_value(target, attr) for attr in ('status', 'country', 'state', 'difficulty', 'ready_in_minutes')))
+    _record(target, old, _current(target))
+
+
+@event.listens_for(Recipe, 'after_delete')
+def _recipe_deleted(mapper, connection, target):
+    _record(target, _current(target), None)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_pending(session):
+    pending = session.info.pop('facet_deltas', None)
+    if pending:
+        _totals.apply(pending['deltas'], pending['events'])
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _drop_pending(session, previous_transaction):
+    session.info.pop('facet_deltas', None)
+
+
+def stats():
+    with _filtered_lock:
+        filtered = len(_filtered)
+    return {'version': _totals.version, 'rebuilds': _totals.rebuilds, 'deltas': _totals.deltas,
+            'filtered_entries': filtered}
@@ -1,8 +1,8 @@
 import requests
-import time
 import re
 from app import app, db
 from models import Recipe
+import rate_limit
 import os
 from dotenv import load_dotenv
 
@@ -15,10 +15,13 @@ def fetch_recipes():
     recipes_data = []
     search_terms = ['chicken', 'pasta', 'rice', 'soup', 'salad']
     request_count = 0
+    # Spoonacular quota (SPOONACULAR_RPM) saare processes ke beech shared
+    limiter = rate_limit.limiter('spoonacular', SPOONACULAR_API_KEY)
 
     for term in search_terms:
         if request_count >= 10: break
         try:
+            if limiter: limiter.acquire()
             response = requests.get(
                 "https://api.spoonacular.com/recipes/complexSearch",
                 params={
@@ -37,7 +40,6 @@ def fetch_recipes():
                     processed = process_recipe(recipe)
                     if processed: recipes_data.append(processed)
                 print(f"✅ Got {len(data.get('results', []))} {term} recipes")
-            time.sleep(1)
         except Exception as e:
             print(f"❌ Error with {term}: {e}")
 
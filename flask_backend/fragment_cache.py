@@ -0,0 +1,102 @@
+import os
+import json
+import zlib
+import struct
+from sqlalchemy import event
+from models import Recipe
+from translation_store import ByteLRU
+
+# Har recipe ka pehle se encode kiya hua JSON (aur gzip ke liye deflate) — key me recipe.version hai,
+# isliye edit/like/comment ke baad purana fragment kabhi serve nahi hota. List responses in
+# fragments ko jod ke bante hain: na to_dict(), na jsonify.
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+GZIP_ENABLED = os.getenv('RESPONSE_GZIP', '1') not in ('0', 'false')
+GZIP_LEVEL = 6
+GZIP_MIN_BYTES = 1024
+
+# mtime 0, OS unknown; aur ek khaali "final" deflate block jo stream band karta hai
+_GZIP_HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff'
+_FINAL_BLOCK = b'\x03\x00'
+
+
+def _deflate(raw):
+    # Raw deflate + SYNC_FLUSH: byte-aligned aur bina final bit ke, isliye kai fragments seedha jud jaate hain
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, -15)
+    return compressor.compress(raw) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+class Fragment:
+    __slots__ = ('raw', 'deflated')
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.deflated = _deflate(raw) if GZIP_ENABLED else None
+
+    def __len__(self):
+        return len(self.raw) + len(self.deflated or b'')
+
+
+def encode(obj):
+    return Fragment(json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+
+
+_OPEN, _SEP, _CLOSE = Fragment(b'['), Fragment(b','), Fragment(b']')
+
+
+def _body(pieces, gzip):
+    if not gzip:
+        return b''.join(piece.raw for piece in pieces)
+    crc = size = 0
+    for piece in pieces:
+        crc = zlib.crc32(piece.raw, crc)
+        size += len(piece.raw)
+    return (_GZIP_HEADER + b''.join(piece.deflated for piece in pieces) + _FINAL_BLOCK
+            + struct.pack('<II', crc, size & 0xffffffff))
+
+
+def wants_gzip(fragments, accept_encodings):
+    return (GZIP_ENABLED and accept_encodings['gzip'] > 0
+            and sum(len(fragment.raw) for fragment in fragments) >= GZIP_MIN_BYTES)
+
+
+def array_body(fragments, gzip=False):
+    """JSON array bytes (gzip=True: ek valid gzip stream) — fragments dobara encode/compress nahi hote."""
+    pieces = [_OPEN]
+    for i, fragment in enumerate(fragments):
+        if i:
+            pieces.append(_SEP)
+        pieces.append(fragment)
+    pieces.append(_CLOSE)
+    return _body(pieces, gzip)
+
+
+def object_body(fragment, gzip=False):
+    return _body([fragment], gzip)
+
+
+_cache = ByteLRU(int(os.getenv('FRAGMENT_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)), sizeof=len)
+
+
+def get(recipe_id, lang, variant, version):
+    return _cache.get((recipe_id, lang, variant, version))
+
+
+def put(recipe_id, lang, variant, version, obj):
+    fragment = encode(obj)
+    _cache.put((recipe_id, lang, variant, version), fragment)
+    return fragment
+
+
+def forget(recipe_id):
+    _cache.discard(lambda key: key[0] == recipe_id)
+
+
+@event.listens_for(Recipe, 'after_update')
+@event.listens_for(Recipe, 'after_delete')
+def _recipe_changed(mapper, connection, target):
+    # Version key se stale fragment waise bhi miss hota; ye bas purani copies ki memory chhodta hai
+    forget(target.id)
+
+
+def stats():
+    return {**_cache.stats(), 'gzip': GZIP_ENABLED}
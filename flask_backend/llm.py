@@ -0,0 +1,366 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+try:
+    import fcntl
+except ImportError:  # Windows: cross-process coalescing nahi, thread-level phir bhi chalta hai
+    fcntl = None
+
+import rate_limit
+
+
+# Gemini calls Flask request thread me nahi, is bounded pool me chalti hain
+MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 8))
+MAX_QUEUE = int(os.getenv('LLM_MAX_QUEUE', MAX_CONCURRENCY))
+TIMEOUT_SECONDS = float(os.getenv('LLM_TIMEOUT_SECONDS', 15))
+# Live requests quota ke liye itna hi rukti hain; scripts max_wait=None dekar poora intezaar karti hain
+RATE_MAX_WAIT_SECONDS = float(os.getenv('LLM_RATE_MAX_WAIT_SECONDS', 2))
+
+
+class LLMUnavailable(Exception):
+    """Breaker open, pool full ya deadline miss: caller apna fallback use kare."""
+
+
+class LLMRateLimited(LLMUnavailable):
+    """Provider ka shared quota khatam; retry_after seconds baad token milega."""
+
+    def __init__(self, retry_after):
+        super().__init__(f'LLM rate limit reached, retry after {retry_after:.1f}s')
+        self.retry_after = retry_after
+
+
+class LLMPoolSaturated(LLMUnavailable):
+    """Apna bounded pool bhara hua hai; provider ki koi galti nahi, isliye breaker isse nahi khulta."""
+
+
+def prompt_key(prompt):
+    """Whitespace/indentation ka farak ignore karke prompt ka stable key."""
+    normalized = re.sub(r'\s+', ' ', prompt).strip()
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Ek key ke concurrent calls me sirf ek (leader) asli kaam karta hai, baaki uska
+    result share karte hain. lock_dir diya ho to doosre worker processes bhi flock
+    ke through coalesce hote hain: leader result ko share_ttl seconds ke liye ek
+    spool file me likhta hai aur lock ke peeche wait kar rahe processes wahi padhte hain.
+    """
+
+    def __init__(self, lock_dir=None, share_ttl=30):
+        self.lock_dir = lock_dir if fcntl else None
+        self.share_ttl = share_ttl
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = self.shared = 0
+        self._writes = 0
+        if self.lock_dir:
+            os.makedirs(self.lock_dir, exist_ok=True)
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run_shared(key, fn) if self.lock_dir else fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _run_shared(self, key, fn):
+        spool = os.path.join(self.lock_dir, f'{key}.json')
+        with open(os.path.join(self.lock_dir, f'{key}.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    if time.time() - os.path.getmtime(spool) < self.share_ttl:
+                        with open(spool) as f:
+                            self.shared += 1
+                            return json.load(f)
+                except (OSError, ValueError):
+                    pass
+                result = fn()
+                tmp = f'{spool}.{os.getpid()}.tmp'
+                with open(tmp, 'w') as f:
+                    json.dump(result, f, ensure_ascii=False)
+                os.replace(tmp, spool)
+                self._writes += 1
+                if self._writes % 100 == 0:
+                    self._sweep()
+                return result
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _sweep(self):
+        """Purani spool/lock files hatao taaki directory bounded rahe."""
+        cutoff = time.time() - 2 * self.share_ttl
+        for name in os.listdir(self.lock_dir):
+            path = os.path.join(self.lock_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return {'leaders': self.leaders, 'shared': self.shared, 'in_flight': len(self._calls)}
+
+
+class CircuitBreaker:
+    """
+    closed -> (failure_threshold lagatar failures) -> open -> (reset_timeout baad)
+    half_open -> ek trial call: success pe closed, fail pe phir open.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = 'half_open'
+                self._trial_running = False
+            if self.state == 'closed':
+                return True
+            if self.state == 'half_open' and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def release(self):
+        """allow() ke baad call provider tak pahunchi hi nahi (quota/pool ne roka): half-open trial wapas do."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                if self.state != 'open':
+                    self.times_opened += 1
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+    def stats(self):
+        with self._lock:
+            return {'state': self.state, 'consecutive_failures': self.failures, 'times_opened': self.times_opened}
+
+
+class BoundedExecutor:
+    """ThreadPool + queue limit + per-call deadline. Timeout pe thread pool me hi khatam hota hai."""
+
+    def __init__(self, max_workers, max_queue):
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='llm')
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.active = 0
+        self.rejected = self.timeouts = self.errors = self.completed = 0
+
+    def _run(self, fn):
+        with self._lock:
+            self.active += 1
+        try:
+            return fn()
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.pending -= 1
+
+    def call(self, fn, timeout):
+        with self._lock:
+            if self.pending >= self.capacity:
+                self.rejected += 1
+                raise LLMPoolSaturated('LLM pool saturated')
+            self.pending += 1
+        future = self._pool.submit(self._run, fn)
+        try:
+            result = future.result(timeout=timeout)
+        except FutureTimeout:
+            with self._lock:
+                self.timeouts += 1
+            raise LLMUnavailable(f'LLM call exceeded {timeout}s deadline')
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        with self._lock:
+            self.completed += 1
+        return result
+
+    @contextmanager
+    def slot(self):
+        """
+        Streaming call ke liye capacity me se ek jagah, stream khatam hone tak. Stream request thread
+        me hi padha jaata hai (pool thread nahi), par concurrent streams + calls milke capacity se upar nahi jaate.
+        """
+        with self._lock:
+            if self.pending >= self.capacity:
+                self.rejected += 1
+                raise LLMPoolSaturated('LLM pool saturated')
+            self.pending += 1
+            self.active += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.pending -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'active': self.active,
+                'queued': self.pending - self.active,
+                'saturation': round(self.pending / self.capacity, 3),
+                'completed': self.completed,
+                'errors': self.errors,
+                'timeouts': self.timeouts,
+                'rejected': self.rejected,
+            }
+
+
+# LLM_SINGLEFLIGHT_DIR set ho (e.g. instance/llm_inflight) to gunicorn workers ke beech bhi coalescing
+_flight = SingleFlight(lock_dir=os.getenv('LLM_SINGLEFLIGHT_DIR'))
+_executor = BoundedExecutor(MAX_CONCURRENCY, MAX_QUEUE)
+_breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv('LLM_BREAKER_FAILURES', 5)),
+    reset_timeout=float(os.getenv('LLM_BREAKER_RESET_SECONDS', 30)),
+)
+
+
+def _throttle(provider, max_wait):
+    bucket = rate_limit.limiter(provider.name, provider.api_key)
+    if bucket is not None:
+        try:
+            bucket.acquire(max_wait)
+        except rate_limit.RateLimited as e:
+            raise LLMRateLimited(e.retry_after) from e
+
+
+def _admit(provider, max_wait):
+    # Breaker pehle: open ho to quota ka token nahi jalta aur bucket ke liye rukna bhi nahi padta
+    if not _breaker.allow():
+        raise LLMUnavailable('LLM circuit breaker open')
+    try:
+        _throttle(provider, max_wait)
+    except LLMRateLimited:
+        _breaker.release()
+        raise
+
+
+def _guarded_call(provider, prompt, timeout, max_wait):
+    _admit(provider, max_wait)
+    try:
+        text = _executor.call(lambda: provider.generate(prompt, timeout), timeout)
+    except LLMPoolSaturated:
+        # Local load: call provider tak gayi hi nahi. Sirf provider errors aur deadline miss failure hain.
+        _breaker.release()
+        raise
+    except Exception:
+        _breaker.record_failure()
+        raise
+    _breaker.record_success()
+    return text
+
+
+def generate_text(provider, prompt, timeout=TIMEOUT_SECONDS, max_wait=RATE_MAX_WAIT_SECONDS):
+    """
+    provider.generate(prompt), lekin:
+    - ek jaise concurrent prompts (same recipe ka Hindi translation, same sawal) ke liye sirf ek Gemini call
+    - bounded pool me, deadline ke saath (Flask worker kabhi Gemini pe atka nahi rehta)
+    - breaker open ho to turant LLMUnavailable, taaki route apna fallback de de
+    - provider ke shared token bucket se; max_wait me token na mile to LLMRateLimited
+    """
+    return _flight.do(prompt_key(prompt), lambda: _guarded_call(provider, prompt, timeout, max_wait))
+
+
+def stream_text(provider, prompt, timeout=TIMEOUT_SECONDS, max_wait=RATE_MAX_WAIT_SECONDS):
+    """
+    Provider ke streaming text pieces. Breaker aur bounded pool ka slot yahan bhi lagte hain;
+    stream request thread me hi padha jaata hai (coalescing nahi, har listener ka apna stream).
+    """
+    _admit(provider, max_wait)
+    try:
+        with _executor.slot():
+            for piece in provider.stream(prompt, timeout):
+                yield piece
+    except LLMPoolSaturated:
+        _breaker.release()
+        raise
+    except GeneratorExit:
+        # Client beech me chala gaya; provider ne koi error nahi diya
+        _breaker.record_success()
+        raise
+    except Exception:
+        _breaker.record_failure()
+        raise
+    _breaker.record_success()
+
+
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?।])\s+')
+
+
+def sentence_chunks(pieces):
+    """Stream ke tukdon ko poore sentences me jodo ('*' markdown hata ke), taaki TTS turant bol sake."""
+    buffer = ''
+    for piece in pieces:
+        buffer += piece.replace('*', '')
+        *sentences, buffer = _SENTENCE_END_RE.split(buffer)
+        for sentence in sentences:
+            if sentence.strip():
+                yield sentence.strip()
+    if buffer.strip():
+        yield buffer.strip()
+
+
+def stats():
+    return {'single_flight': _flight.stats(), 'pool': _executor.stats(), 'breaker': _breaker.stats(),
+            'rate_limits': rate_limit.stats()}
@@ -0,0 +1,161 @@
+import os
+import re
+import json
+import math
+import time
+import random
+import hashlib
+import threading
+
+# LLM_PROVIDER=gemini (default) | stub
+#   stub: network/quota ke bina load tests aur benchmarks, har run me same latencies/errors
+DEFAULT_GEMINI_MODEL = 'gemini-flash-latest'
+
+
+class LLMProvider:
+    """Ek LLM backend. generate() poora text deta hai, stream() text ke tukde."""
+
+    name = 'base'
+    api_key = None  # rate_limit bucket isi (name, api_key) pe banta hai
+
+    def generate(self, prompt, timeout):
+        raise NotImplementedError
+
+    def stream(self, prompt, timeout):
+        yield self.generate(prompt, timeout)
+
+
+class GeminiProvider(LLMProvider):
+    name = 'gemini'
+
+    def __init__(self, api_key, model_name=DEFAULT_GEMINI_MODEL):
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self.api_key = api_key
+        self.model_name = model_name
+        self._model = genai.GenerativeModel(model_name)
+
+    def generate(self, prompt, timeout):
+        return self._model.generate_content(prompt, request_options={'timeout': timeout}).text
+
+    def stream(self, prompt, timeout):
+        for chunk in self._model.generate_content(prompt, stream=True, request_options={'timeout': timeout}):
+            yield chunk.text
+
+
+class StubProviderError(RuntimeError):
+    """Stub ka simulated API failure (LLM_STUB_ERROR_RATE)."""
+
+
+class StubProvider(LLMProvider):
+    """
+    Deterministic local LLM. Latency lognormal hai (median latency_ms, spread sigma);
+    error/latency har (seed, prompt, us prompt ki kitni baar call hui) se tay hote hain,
+    isliye concurrent load me bhi ek run doosre jaisa hi rehta hai. Jawab prompt ke
+    hisaab se bante hain taaki translation aur seeding ka parsing bhi chal sake.
+    """
+
+    name = 'stub'
+
+    def __init__(self, latency_ms=800, sigma=0.5, error_rate=0.0, chunk_chars=40,
+                 chunk_ms=50, seed=0):
+        self.latency_ms = latency_ms
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.chunk_chars = chunk_chars
+        self.chunk_ms = chunk_ms
+        self.seed = seed
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def _rng(self, prompt):
+        key = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        with self._lock:
+            n = self._seen.get(key, 0)
+            self._seen[key] = n + 1
+        return random.Random(f'{self.seed}:{key}:{n}')
+
+    def _wait(self, rng, timeout):
+        latency = self.latency_ms / 1000.0 * math.exp(rng.gauss(0, self.sigma)) if self.latency_ms else 0.0
+        if latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f'stub LLM exceeded {timeout}s')
+        time.sleep(latency)
+        if rng.random() < self.error_rate:
+            raise StubProviderError('stub LLM simulated failure')
+
+    def generate(self, prompt, timeout):
+        self._wait(self._rng(prompt), timeout)
+        return self.reply(prompt)
+
+    def stream(self, prompt, timeout):
+        self._wait(self._rng(prompt), timeout)
+        text = self.reply(prompt)
+        for start in range(0, len(text), self.chunk_chars):
+            if start:
+                time.sleep(self.chunk_ms / 1000.0)
+            yield text[start:start + self.chunk_chars]
+
+    def reply(self, prompt):
+        # Recipe seeding: "exactly N ... JSON array"
+        count = re.search(r'exactly (\d+)', prompt)
+        if count and 'JSON array' in prompt:
+            return json.dumps([self._fake_recipe(prompt, i) for i in range(int(count.group(1)))])
+        # Translation: prompt me diya JSON object hi (marked) wapas, taaki parse_translation chale
+        source = re.search(r'\{.*\}', prompt, re.DOTALL)
+        if source and 'Translate' in prompt:
+            try:
+                return json.dumps(_mark(json.loads(source.group(0))), ensure_ascii=False)
+            except ValueError:
+                pass
+        quoted = re.search(r'Text: "(.*)"', prompt)
+        if quoted:
+            return quoted.group(1)
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:8]
+        return f"This is a stub answer {digest}. It has a second sentence. And a third one!"
+
+    def _fake_recipe(self, prompt, i):
+        digest = hashlib.sha256(f'{prompt}:{i}'.encode('utf-8')).hexdigest()[:6]
+        return {
+            'title': f'Stub Dish {digest}',
+            'description': 'A deterministic dish from the local stub.',
+            'image_url': f'https://via.placeholder.com/400x300?text=Stub+{digest}',
+            'ready_in_minutes': 10 + i * 5,
+            'servings': 2,
+            'difficulty': 'Easy',
+            'ingredients': ['water', 'salt'],
+            'steps': ['Mix everything.', 'Serve hot.'],
+        }
+
+
+def _mark(value):
+    if isinstance(value, str):
+        return f'[stub] {value}' if value else value
+    if isinstance(value, list):
+        return [_mark(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _mark(v) for k, v in value.items()}
+    return value
+
+
+def get_provider():
+    """Env se provider banao. Gemini key na ho (ya connect fail ho) to None: routes apna fallback dete hain."""
+    kind = os.getenv('LLM_PROVIDER', 'gemini').lower()
+    if kind == 'stub':
+        return StubProvider(
+            latency_ms=float(os.getenv('LLM_STUB_LATENCY_MS', 800)),
+            sigma=float(os.getenv('LLM_STUB_LATENCY_SIGMA', 0.5)),
+            error_rate=float(os.getenv('LLM_STUB_ERROR_RATE', 0)),
+            chunk_chars=int(os.getenv('LLM_STUB_CHUNK_CHARS', 40)),
+            chunk_ms=float(os.getenv('LLM_STUB_CHUNK_MS', 50)),
+            seed=os.getenv('LLM_STUB_SEED', '0'),
+        )
+
+    api_key = os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        return None
+    try:
+        return GeminiProvider(api_key, os.getenv('GEMINI_MODEL', DEFAULT_GEMINI_MODEL))
+    except Exception as e:
+        print(f"❌ Gemini Connection Failed: {e}")
+        return None
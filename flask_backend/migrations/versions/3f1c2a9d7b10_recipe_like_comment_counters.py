@@ -0,0 +1,40 @@
+"""recipe like and comment counters
+
+Revision ID: 3f1c2a9d7b10
+Revises:
+Create Date: 2026-10-17 23:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _recipe_columns():
+    return {c['name'] for c in sa.inspect(op.get_bind()).get_columns('recipe')}
+
+
+def upgrade():
+    existing = _recipe_columns()
+    for name in ('likes_count', 'comments_count'):
+        if name not in existing:
+            op.add_column('recipe', sa.Column(name, sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from the source rows (same SQL as `flask reconcile-counters`)
+    op.execute(
+        'UPDATE recipe SET '
+        'likes_count = (SELECT COUNT(*) FROM "like" WHERE "like".recipe_id = recipe.id), '
+        'comments_count = (SELECT COUNT(*) FROM comment WHERE comment.recipe_id = recipe.id)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('recipe') as batch_op:
+        batch_op.drop_column('comments_count')
+        batch_op.drop_column('likes_count')
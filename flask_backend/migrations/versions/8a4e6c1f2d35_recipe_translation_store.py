@@ -0,0 +1,37 @@
+"""recipe translation store
+
+Revision ID: 8a4e6c1f2d35
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-17 23:55:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e6c1f2d35'
+down_revision = '3f1c2a9d7b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('recipe_translation'):
+        return
+    op.create_table(
+        'recipe_translation',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('recipe_id', sa.Integer(), nullable=False),
+        sa.Column('lang', sa.String(length=10), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['recipe_id'], ['recipe.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('recipe_id', 'lang', 'content_hash')
+    )
+
+
+def downgrade():
+    op.drop_table('recipe_translation')
@@ -0,0 +1,47 @@
+"""recipe change feed and tombstone horizon
+
+Revision ID: a3c5e7f9b1d4
+Revises: f4c6e8a0b2d7
+Create Date: 2026-10-18 04:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c5e7f9b1d4'
+down_revision = 'f4c6e8a0b2d7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table('recipe_change'):
+        op.create_table(
+            'recipe_change',
+            sa.Column('seq', sa.Integer(), nullable=False),
+            sa.Column('recipe_id', sa.Integer(), nullable=False),
+            sa.Column('deleted', sa.Boolean(), nullable=False, server_default='0'),
+            sa.Column('changed_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('seq'),
+            sa.UniqueConstraint('recipe_id'),
+            sqlite_autoincrement=True
+        )
+    if 'compacted_seq' not in {c['name'] for c in inspector.get_columns('catalog_version')}:
+        op.add_column('catalog_version', sa.Column('compacted_seq', sa.Integer(), nullable=False, server_default='0'))
+
+    # Har maujooda recipe ek baar feed me, taaki since=0 se poora catalog mil sake
+    op.execute(
+        "INSERT INTO recipe_change (recipe_id, deleted, changed_at) "
+        "SELECT id, 0, CURRENT_TIMESTAMP FROM recipe "
+        "WHERE id NOT IN (SELECT recipe_id FROM recipe_change) ORDER BY id"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('catalog_version') as batch_op:
+        batch_op.drop_column('compacted_seq')
+    op.drop_table('recipe_change')
@@ -0,0 +1,27 @@
+"""catalog_version.titles_version for the translated title index
+
+Revision ID: a5c7e9b1d3f4
+Revises: e1a3c5d7f9b2
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5c7e9b1d3f4'
+down_revision = 'e1a3c5d7f9b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # recipe_title_fts me naya hi/mr title aane pe /search ka ETag badalna chahiye (recipe version nahi badalta)
+    if 'titles_version' not in {c['name'] for c in sa.inspect(op.get_bind()).get_columns('catalog_version')}:
+        op.add_column('catalog_version', sa.Column('titles_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('catalog_version') as batch_op:
+        batch_op.drop_column('titles_version')
@@ -0,0 +1,58 @@
+"""indexes for hot queries (single, composite, partial)
+
+Revision ID: b5d7f9a1c3e6
+Revises: a3c5e7f9b1d4
+Create Date: 2026-10-18 04:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5d7f9a1c3e6'
+down_revision = 'a3c5e7f9b1d4'
+branch_labels = None
+depends_on = None
+
+APPROVED = "status = 'approved'"
+
+# table -> [(name, columns, partial WHERE)]
+INDEXES = {
+    'like': [
+        ('ix_like_user_id_recipe_id', ['user_id', 'recipe_id'], None),
+        ('ix_like_recipe_id', ['recipe_id'], None),
+    ],
+    'comment': [
+        ('ix_comment_recipe_id', ['recipe_id'], None),
+    ],
+    'recipe': [
+        ('ix_recipe_author_id', ['author_id'], None),
+        ('ix_recipe_title', ['title'], None),
+        ('ix_recipe_approved_id', ['id'], APPROVED),
+        ('ix_recipe_approved_likes', ['likes_count', 'id'], APPROVED),
+    ],
+    'recipe_card': [
+        ('ix_recipe_card_approved_likes', ['likes_count', 'id'], APPROVED),
+        ('ix_recipe_card_approved_title', ['title', 'id'], APPROVED),
+    ],
+    'recipe_change': [
+        ('ix_recipe_change_tombstone_changed_at', ['changed_at'], 'deleted = 1'),
+    ],
+}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    for table, indexes in INDEXES.items():
+        existing = {index['name'] for index in inspector.get_indexes(table)}
+        for name, columns, where in indexes:
+            if name not in existing:
+                op.create_index(name, table, columns, sqlite_where=sa.text(where) if where else None)
+
+
+def downgrade():
+    for table, indexes in INDEXES.items():
+        for name, _, _ in indexes:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,36 @@
+"""translation memory segments
+
+Revision ID: c5d7e9f1a246
+Revises: 8a4e6c1f2d35
+Create Date: 2026-10-18 01:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d7e9f1a246'
+down_revision = '8a4e6c1f2d35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('translation_segment'):
+        return
+    op.create_table(
+        'translation_segment',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('lang', sa.String(length=10), nullable=False),
+        sa.Column('source_hash', sa.String(length=64), nullable=False),
+        sa.Column('source', sa.Text(), nullable=False),
+        sa.Column('target', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('lang', 'source_hash')
+    )
+
+
+def downgrade():
+    op.drop_table('translation_segment')
@@ -0,0 +1,52 @@
+"""recipe ids never reused (AUTOINCREMENT)
+
+Revision ID: c7e9a1b3d5f8
+Revises: b5d7f9a1c3e6
+Create Date: 2026-10-18 06:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e9a1b3d5f8'
+down_revision = 'b5d7f9a1c3e6'
+branch_labels = None
+depends_on = None
+
+
+def _has_autoincrement(bind):
+    sql = bind.execute(sa.text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'recipe'")).scalar()
+    return 'AUTOINCREMENT' in (sql or '').upper()
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    if not _has_autoincrement(bind):
+        # SQLite me AUTOINCREMENT sirf CREATE TABLE pe lagta hai, isliye table dobara banti hai
+        with op.batch_alter_table('recipe', recreate='always',
+                                  table_kwargs={'sqlite_autoincrement': True}) as batch_op:
+            pass
+
+    # Jo recipes pehle hi delete ho chuki (change feed tombstones) unke id bhi aage na milein
+    op.execute(
+        "UPDATE sqlite_sequence SET seq = max(seq, "
+        "(SELECT coalesce(max(recipe_id), 0) FROM recipe_change)) WHERE name = 'recipe'"
+    )
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) "
+        "SELECT 'recipe', max(coalesce((SELECT max(id) FROM recipe), 0), "
+        "coalesce((SELECT max(recipe_id) FROM recipe_change), 0)) "
+        "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'recipe')"
+    )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite' and _has_autoincrement(bind):
+        with op.batch_alter_table('recipe', recreate='always',
+                                  table_kwargs={'sqlite_autoincrement': False}) as batch_op:
+            pass
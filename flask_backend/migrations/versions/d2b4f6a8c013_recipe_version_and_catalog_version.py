@@ -0,0 +1,45 @@
+"""recipe version/updated_at and catalog version
+
+Revision ID: d2b4f6a8c013
+Revises: c5d7e9f1a246
+Create Date: 2026-10-18 02:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2b4f6a8c013'
+down_revision = 'c5d7e9f1a246'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    columns = {c['name'] for c in inspector.get_columns('recipe')}
+
+    if 'version' not in columns:
+        op.add_column('recipe', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+    if 'updated_at' not in columns:
+        op.add_column('recipe', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE recipe SET updated_at = CURRENT_TIMESTAMP WHERE updated_at IS NULL")
+
+    if not inspector.has_table('catalog_version'):
+        op.create_table(
+            'catalog_version',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+    op.execute("INSERT INTO catalog_version (id, version, updated_at) "
+               "SELECT 1, 1, CURRENT_TIMESTAMP WHERE NOT EXISTS (SELECT 1 FROM catalog_version WHERE id = 1)")
+
+
+def downgrade():
+    op.drop_table('catalog_version')
+    with op.batch_alter_table('recipe') as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('version')
@@ -0,0 +1,27 @@
+"""recipe (status, id) index for newest-first pages
+
+Revision ID: d9f1b3c5e7a2
+Revises: c7e9a1b3d5f8
+Create Date: 2026-10-18 06:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9f1b3c5e7a2'
+down_revision = 'c7e9a1b3d5f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (status, country, state) wale index se status=? ke baad rows id order me nahi milti thi
+    # (USE TEMP B-TREE FOR ORDER BY); ye index /recipes ka seedha keyset seek wapas deta hai
+    if 'ix_recipe_status_id' not in {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('recipe')}:
+        op.create_index('ix_recipe_status_id', 'recipe', ['status', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_recipe_status_id', table_name='recipe')
@@ -0,0 +1,76 @@
+"""(status, sort key, id) indexes instead of partial approved indexes
+
+Revision ID: e1a3c5d7f9b2
+Revises: d9f1b3c5e7a2
+Create Date: 2026-10-18 06:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1a3c5d7f9b2'
+down_revision = 'd9f1b3c5e7a2'
+branch_labels = None
+depends_on = None
+
+APPROVED = "status = 'approved'"
+NULLS_LAST = sa.text('ready_in_minutes IS NULL')
+
+# Planner bound `status = ?` ko partial WHERE se match nahi karta tha aur (status, ready_in_minutes) range
+# ke baad id order ke liye temp B-tree banata tha; ye sab (status, sort key, id) se badle
+DROPPED = {
+    'recipe': [
+        ('ix_recipe_approved_id', ['id'], APPROVED),
+        ('ix_recipe_approved_likes', ['likes_count', 'id'], APPROVED),
+        ('ix_recipe_status_ready_in_minutes', ['status', 'ready_in_minutes'], None),
+    ],
+    'recipe_card': [
+        ('ix_recipe_card_approved_likes', ['likes_count', 'id'], APPROVED),
+        ('ix_recipe_card_approved_title', ['title', 'id'], APPROVED),
+        ('ix_recipe_card_status_ready_in_minutes', ['status', 'ready_in_minutes'], None),
+    ],
+}
+
+INDEXES = {
+    'recipe': [
+        ('ix_recipe_status_likes', ['status', 'likes_count', 'id']),
+        ('ix_recipe_status_title', ['status', 'title', 'id']),
+        ('ix_recipe_status_quickest', ['status', NULLS_LAST, 'ready_in_minutes', 'id']),
+    ],
+    'recipe_card': [
+        ('ix_recipe_card_status_likes', ['status', 'likes_count', 'id']),
+        ('ix_recipe_card_status_title', ['status', 'title', 'id']),
+        ('ix_recipe_card_status_quickest', ['status', NULLS_LAST, 'ready_in_minutes', 'id']),
+    ],
+}
+
+
+def _index_names(table):
+    # Inspector expression indexes (ready_in_minutes IS NULL) reflect nahi karta, isliye seedha sqlite_master
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        rows = bind.execute(sa.text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"),
+                            {'table': table})
+        return {row[0] for row in rows}
+    return {index['name'] for index in sa.inspect(bind).get_indexes(table)}
+
+
+def upgrade():
+    for table in INDEXES:
+        existing = _index_names(table)
+        for name, _, _ in DROPPED[table]:
+            if name in existing:
+                op.drop_index(name, table_name=table)
+        for name, columns in INDEXES[table]:
+            if name not in existing:
+                op.create_index(name, table, columns)
+
+
+def downgrade():
+    for table in INDEXES:
+        for name, _ in INDEXES[table]:
+            op.drop_index(name, table_name=table)
+        for name, columns, where in DROPPED[table]:
+            op.create_index(name, table, columns, sqlite_where=sa.text(where) if where else None)
@@ -0,0 +1,52 @@
+"""recipe_card read model
+
+Revision ID: e7a9c1b3d5f2
+Revises: d2b4f6a8c013
+Create Date: 2026-10-18 03:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a9c1b3d5f2'
+down_revision = 'd2b4f6a8c013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table('recipe_card'):
+        op.create_table(
+            'recipe_card',
+            sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('status', sa.String(length=20), nullable=True),
+            sa.Column('title', sa.String(length=100), nullable=False),
+            sa.Column('image_url', sa.String(length=300), nullable=True),
+            sa.Column('ready_in_minutes', sa.Integer(), nullable=True),
+            sa.Column('servings', sa.Integer(), nullable=True),
+            sa.Column('difficulty', sa.String(length=20), nullable=True),
+            sa.Column('country', sa.String(length=50), nullable=True),
+            sa.Column('state', sa.String(length=50), nullable=True),
+            sa.Column('likes_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('version', sa.Integer(), nullable=False, server_default='1'),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_recipe_card_status_id', 'recipe_card', ['status', 'id'])
+
+    # Backfill; thumbnail URL agli refresh / `flask rebuild-recipe-cards` pe normalize hota hai
+    op.execute(
+        "INSERT INTO recipe_card (id, status, title, image_url, ready_in_minutes, servings, difficulty, "
+        "country, state, likes_count, version) "
+        "SELECT id, status, title, image_url, ready_in_minutes, servings, difficulty, country, state, "
+        "COALESCE(likes_count, 0), version FROM recipe "
+        "WHERE id NOT IN (SELECT id FROM recipe_card)"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_recipe_card_status_id', table_name='recipe_card')
+    op.drop_table('recipe_card')
@@ -0,0 +1,49 @@
+"""recipe filter indexes and recipe_card.author_id
+
+Revision ID: f4c6e8a0b2d7
+Revises: e7a9c1b3d5f2
+Create Date: 2026-10-18 03:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4c6e8a0b2d7'
+down_revision = 'e7a9c1b3d5f2'
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    'recipe': {
+        'ix_recipe_status_country_state': ['status', 'country', 'state'],
+        'ix_recipe_status_ready_in_minutes': ['status', 'ready_in_minutes'],
+    },
+    'recipe_card': {
+        'ix_recipe_card_status_country_state': ['status', 'country', 'state'],
+        'ix_recipe_card_status_ready_in_minutes': ['status', 'ready_in_minutes'],
+    },
+}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if 'author_id' not in {c['name'] for c in inspector.get_columns('recipe_card')}:
+        op.add_column('recipe_card', sa.Column('author_id', sa.Integer(), nullable=True))
+    op.execute("UPDATE recipe_card SET author_id = (SELECT author_id FROM recipe WHERE recipe.id = recipe_card.id)")
+
+    for table, indexes in INDEXES.items():
+        existing = {index['name'] for index in inspector.get_indexes(table)}
+        for name, columns in indexes.items():
+            if name not in existing:
+                op.create_index(name, table, columns)
+
+
+def downgrade():
+    for table, indexes in INDEXES.items():
+        for name in indexes:
+            op.drop_index(name, table_name=table)
+    with op.batch_alter_table('recipe_card') as batch_op:
+        batch_op.drop_column('author_id')
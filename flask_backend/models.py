@@ -1,15 +1,26 @@
+import re
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy import event, func
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 
 db = SQLAlchemy()
 
 class Like(db.Model):
+    # is_liked/toggle_like (user, recipe) pe; reconcile/delete recipe_id pe
+    __table_args__ = (
+        db.Index('ix_like_user_id_recipe_id', 'user_id', 'recipe_id'),
+        db.Index('ix_like_recipe_id', 'recipe_id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     recipe_id = db.Column(db.Integer, db.ForeignKey('recipe.id'), nullable=False)
 
 class Comment(db.Model):
+    __table_args__ = (db.Index('ix_comment_recipe_id', 'recipe_id'),)
+
     id = db.Column(db.Integer, primary_key=True)
     text = db.Column(db.Text, nullable=False)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
@@ -17,6 +28,14 @@ class Comment(db.Model):
     recipe_id = db.Column(db.Integer, db.ForeignKey('recipe.id'), nullable=False)
     user = db.relationship('User', backref='comments')
 
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'text': self.text,
+            'user': self.user.name,
+            'date': self.timestamp.strftime('%Y-%m-%d')
+        }
+
 class User(db.Model, UserMixin):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(150), nullable=False)
@@ -35,6 +54,23 @@ class User(db.Model, UserMixin):
         return check_password_hash(self.password_hash, password)
 
 class Recipe(db.Model):
+    # 🔥 Server-side filters (recipe_filters.py): country/state dropdown aur "kitne minute me" filter.
+    # Har sort ka (status, sort key, id) index: approved rows seedha page order me, temp B-tree sort nahi
+    __table_args__ = (
+        db.Index('ix_recipe_status_country_state', 'status', 'country', 'state'),
+        db.Index('ix_recipe_author_id', 'author_id'),
+        db.Index('ix_recipe_title', 'title'),  # seeding dedupe
+        # Newest-first keyset pages: status equality ke baad id order, temp sort nahi
+        db.Index('ix_recipe_status_id', 'status', 'id'),
+        db.Index('ix_recipe_status_likes', 'status', 'likes_count', 'id'),
+        db.Index('ix_recipe_status_title', 'status', 'title', 'id'),
+        # quickest: NULL minutes aakhir me (ORDER BY ready_in_minutes IS NULL, ...); max_minutes filter bhi isi pe
+        db.Index('ix_recipe_status_quickest', 'status', db.text('ready_in_minutes IS NULL'), 'ready_in_minutes', 'id'),
+        # Delete hui recipe ka id dobara na mile: ETag (recipe-{id}-v{version}) aur fragment cache keys
+        # naye recipe ke v1 ko purane v1 se match kar lete
+        {'sqlite_autoincrement': True},
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     spoonacular_id = db.Column(db.Integer, unique=True, nullable=True) 
     
@@ -54,11 +90,22 @@ class Recipe(db.Model):
     
     # 🔥 NEW: Recipe Status (pending, approved, rejected)
     status = db.Column(db.String(20), default='approved') 
+
+    # 🔥 Denormalized counters: toggle_like/add_comment same transaction me update karte hain
+    likes_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    comments_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    # 🔥 Recipe, uske likes ya comments me koi bhi badlav -> version + 1 (ETag / Last-Modified isi se)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     likes = db.relationship('Like', backref='recipe', lazy='dynamic')
     comments = db.relationship('Comment', backref='recipe', lazy=True)
 
-    def to_dict(self):
+    def to_dict(self, comments=None):
+        # comments pass karo to koi extra query nahi chalegi (see serialize_recipes)
+        if comments is None:
+            comments = self.comments
         return {
             'id': self.id,
             'title': self.title,
@@ -74,11 +121,378 @@ class Recipe(db.Model):
             'state': self.state,
             'author_id': self.author_id,
             'status': self.status, # 🔥 Added Status
-            'likes_count': self.likes.count() if hasattr(self.likes, 'count') else len(self.likes),
-            'comments': [{
-                'id': c.id,
-                'text': c.text,
-                'user': c.user.name,
-                'date': c.timestamp.strftime('%Y-%m-%d')
-            } for c in self.comments]
-        }
\ No newline at end of file
+            'likes_count': self.likes_count or 0,
+            'comments_count': self.comments_count or 0,
+            'comments': [c.to_dict() for c in comments]
+        }
+
+
+class RecipeTranslation(db.Model):
+    # 🔥 Persistent translation store (LRU front tier: translation_store.py)
+    __table_args__ = (db.UniqueConstraint('recipe_id', 'lang', 'content_hash'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    recipe_id = db.Column(db.Integer, db.ForeignKey('recipe.id'), nullable=False)
+    lang = db.Column(db.String(10), nullable=False)
+    # sha256 of the English source fields; recipe edit hote hi purani translation miss ho jaati hai
+    content_hash = db.Column(db.String(64), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class TranslationSegment(db.Model):
+    # 🔥 Translation memory: ek ingredient line / step / title ka translation, saari recipes me shared
+    __table_args__ = (db.UniqueConstraint('lang', 'source_hash'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    lang = db.Column(db.String(10), nullable=False)
+    # sha256 of the normalized source segment (translation_memory.segment_key)
+    source_hash = db.Column(db.String(64), nullable=False)
+    source = db.Column(db.Text, nullable=False)
+    target = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class CatalogVersion(db.Model):
+    # 🔥 Single row (id=1): koi bhi recipe insert/update/delete hui to version + 1 (list endpoints ka ETag)
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Is seq tak ke tombstones compact ho chuke; isse purane ?since= wale client ko poora resync chahiye
+    compacted_seq = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Searchable titles badle (recipe title/status, insert/delete, ya hi/mr titles ka index) to +1.
+    # Likes/comments isse nahi chhoote, isliye dish resolver aur /search isse sasta stamp lete hain.
+    titles_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+
+class RecipeChange(db.Model):
+    # 🔥 Change feed (/recipes/changes): har recipe ki sirf aakhri change, naye seq ke saath.
+    # AUTOINCREMENT: seq kabhi reuse nahi hota, isliye "seq > since" hamesha sahi delta deta hai.
+    __tablename__ = 'recipe_change'
+    __table_args__ = (
+        # Compaction sirf purane tombstones dhoondhta hai
+        db.Index('ix_recipe_change_tombstone_changed_at', 'changed_at', sqlite_where=db.text('deleted = 1'),
+                 postgresql_where=db.text('deleted')),
+        {'sqlite_autoincrement': True},
+    )
+
+    seq = db.Column(db.Integer, primary_key=True)
+    recipe_id = db.Column(db.Integer, nullable=False, unique=True)
+    deleted = db.Column(db.Boolean, nullable=False, default=False, server_default='0')  # tombstone
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class RecipeCard(db.Model):
+    # 🔥 Home grid ka read model: sirf card ke columns, Recipe write hote hi (same transaction me) refresh.
+    # ingredients/steps JSON aur comments yahan kabhi nahi aate. id == recipe.id
+    __tablename__ = 'recipe_card'
+    __table_args__ = (
+        db.Index('ix_recipe_card_status_id', 'status', 'id'),
+        db.Index('ix_recipe_card_status_country_state', 'status', 'country', 'state'),
+        db.Index('ix_recipe_card_status_likes', 'status', 'likes_count', 'id'),
+        db.Index('ix_recipe_card_status_title', 'status', 'title', 'id'),
+        db.Index('ix_recipe_card_status_quickest', 'status', db.text('ready_in_minutes IS NULL'),
+                 'ready_in_minutes', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    status = db.Column(db.String(20))
+    title = db.Column(db.String(100), nullable=False)
+    image_url = db.Column(db.String(300))
+    ready_in_minutes = db.Column(db.Integer)
+    servings = db.Column(db.Integer)
+    difficulty = db.Column(db.String(20))
+    country = db.Column(db.String(50))
+    state = db.Column(db.String(50))
+    author_id = db.Column(db.Integer)  # sirf ?author= filter ke liye, response me nahi
+    likes_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'image_url': self.image_url,
+            'cookTime': self.ready_in_minutes,
+            'ready_in_minutes': self.ready_in_minutes,
+            'servings': self.servings,
+            'difficulty': self.difficulty,
+            'country': self.country,
+            'state': self.state,
+            'likes_count': self.likes_count or 0,
+        }
+
+
+# Spoonacular images kai sizes me milti hain; card ke liye 312x231 kaafi hai
+_SPOONACULAR_SIZE = re.compile(r'(img\.spoonacular\.com/recipes/\d+)-\d+x\d+(\.\w+)$')
+
+
+def card_thumbnail(image_url):
+    return _SPOONACULAR_SIZE.sub(r'\1-312x231\2', image_url) if image_url else image_url
+
+
+def _card_select(where=None):
+    query = db.select(Recipe.id, Recipe.status, Recipe.title, Recipe.image_url, Recipe.ready_in_minutes,
+                      Recipe.servings, Recipe.difficulty, Recipe.country, Recipe.state, Recipe.author_id,
+                      func.coalesce(Recipe.likes_count, 0), Recipe.version)
+    return query.where(where) if where is not None else query
+
+
+def _write_cards(connection, rows):
+    rows = [dict(zip(('id', 'status', 'title', 'image_url', 'ready_in_minutes', 'servings', 'difficulty',
+                      'country', 'state', 'author_id', 'likes_count', 'version'), row)) for row in rows]
+    for row in rows:
+        row['image_url'] = card_thumbnail(row['image_url'])
+    if rows:
+        connection.execute(db.insert(RecipeCard), rows)
+    return len(rows)
+
+
+def refresh_recipe_card(connection, recipe_id):
+    """Ek recipe ka card DB ki current row se dobara likho (counter expressions bhi resolve ho jaate hain)."""
+    connection.execute(db.delete(RecipeCard).where(RecipeCard.id == recipe_id))
+    _write_cards(connection, connection.execute(_card_select(Recipe.id == recipe_id)).all())
+
+
+def rebuild_recipe_cards(connection):
+    """Poora read model recipe table se dobara banao. Returns cards written."""
+    connection.execute(db.delete(RecipeCard))
+    return _write_cards(connection, connection.execute(_card_select()).all())
+
+
+def recipe_exists(recipe_id):
+    """Fresh SELECT, identity map nahi: background writers ke liye jinke load karne ke baad recipe delete ho sakti hai."""
+    return db.session.query(Recipe.id).filter(Recipe.id == recipe_id).first() is not None
+
+
+def catalog_version():
+    """(version, updated_at) — ek primary key lookup."""
+    row = db.session.query(CatalogVersion.version, CatalogVersion.updated_at).filter(CatalogVersion.id == 1).first()
+    return (row.version, row.updated_at) if row else (0, None)
+
+
+def catalog_stamp():
+    """(version, titles_version, updated_at) — jo responses translated titles ke index pe bhi tike hain (/search)."""
+    row = db.session.query(CatalogVersion.version, CatalogVersion.titles_version, CatalogVersion.updated_at) \
+        .filter(CatalogVersion.id == 1).first()
+    return (row.version, row.titles_version, row.updated_at) if row else (0, 0, None)
+
+
+def bump_titles(connection):
+    now = datetime.utcnow()
+    result = connection.execute(
+        db.update(CatalogVersion).where(CatalogVersion.id == 1)
+        .values(titles_version=CatalogVersion.titles_version + 1, updated_at=now)
+    )
+    if not result.rowcount:
+        connection.execute(db.insert(CatalogVersion).values(id=1, version=0, titles_version=1, updated_at=now))
+
+
+def bump_catalog(connection):
+    now = datetime.utcnow()
+    result = connection.execute(
+        db.update(CatalogVersion).where(CatalogVersion.id == 1)
+        .values(version=CatalogVersion.version + 1, updated_at=now)
+    )
+    if not result.rowcount:
+        connection.execute(db.insert(CatalogVersion).values(id=1, version=1, updated_at=now))
+
+
+def record_changes(connection, recipe_ids, deleted=False):
+    """In recipes ki purani change row hata ke naye seq pe likho."""
+    recipe_ids = list(recipe_ids)
+    if not recipe_ids:
+        return
+    now = datetime.utcnow()
+    connection.execute(db.delete(RecipeChange).where(RecipeChange.recipe_id.in_(recipe_ids)))
+    connection.execute(db.insert(RecipeChange),
+                       [{'recipe_id': recipe_id, 'deleted': deleted, 'changed_at': now} for recipe_id in recipe_ids])
+
+
+def change_horizon():
+    """(latest seq, compacted_seq) — ?since= in dono ke beech ho tabhi delta diya ja sakta hai."""
+    latest = db.session.query(func.max(RecipeChange.seq)).scalar() or 0
+    compacted = db.session.query(CatalogVersion.compacted_seq).filter(CatalogVersion.id == 1).scalar() or 0
+    return max(latest, compacted), compacted
+
+
+def compact_changes(older_than):
+    """older_than (datetime) se purane tombstones hatao. Returns rows deleted."""
+    old = db.session.query(func.max(RecipeChange.seq), func.count(RecipeChange.seq)).filter(
+        RecipeChange.deleted == db.true(), RecipeChange.changed_at < older_than).one()
+    if not old[1]:
+        return 0
+    # Horizon pehle: delete ke baad bhi pata rahe ki kaunse since values ab delta nahi de sakti
+    db.session.execute(db.update(CatalogVersion).where(CatalogVersion.id == 1, CatalogVersion.compacted_seq < old[0])
+                       .values(compacted_seq=old[0]))
+    db.session.execute(db.delete(RecipeChange).where(RecipeChange.deleted == db.true(), RecipeChange.changed_at < older_than))
+    db.session.commit()
+    return old[1]
+
+
+@event.listens_for(Recipe, 'before_update')
+def _bump_recipe_version(mapper, connection, target):
+    # toggle_like/add_comment ke counter updates bhi yahin se guzarte hain
+    if db.session.is_modified(target, include_collections=False):
+        target.version = Recipe.version + 1
+        target.updated_at = datetime.utcnow()
+
+
+@event.listens_for(Recipe, 'after_insert')
+@event.listens_for(Recipe, 'after_update')
+def _bump_catalog_version(mapper, connection, target):
+    bump_catalog(connection)
+    record_changes(connection, [target.id])
+
+
+@event.listens_for(Recipe, 'after_delete')
+def _record_recipe_delete(mapper, connection, target):
+    bump_catalog(connection)
+    record_changes(connection, [target.id], deleted=True)
+
+
+@event.listens_for(Recipe, 'after_insert')
+@event.listens_for(Recipe, 'after_delete')
+def _bump_titles_on_insert_delete(mapper, connection, target):
+    bump_titles(connection)
+
+
+@event.listens_for(Recipe, 'after_update')
+def _bump_titles_on_update(mapper, connection, target):
+    state = db.inspect(target)
+    if state.attrs.title.history.has_changes() or state.attrs.status.history.has_changes():
+        bump_titles(connection)
+
+
+@event.listens_for(Recipe, 'after_insert')
+@event.listens_for(Recipe, 'after_update')
+def _refresh_recipe_card(mapper, connection, target):
+    refresh_recipe_card(connection, target.id)
+
+
+@event.listens_for(Recipe, 'after_delete')
+def _drop_recipe_card(mapper, connection, target):
+    connection.execute(db.delete(RecipeCard).where(RecipeCard.id == target.id))
+
+
+# ?fields= projection: to_dict() ka har key aur use banane ke liye zaruri columns (to_dict wale order me)
+FIELD_COLUMNS = {
+    'id': ('id',),
+    'title': ('title',),
+    'description': ('description',),
+    'image_url': ('image_url',),
+    'cookTime': ('ready_in_minutes',),
+    'ready_in_minutes': ('ready_in_minutes',),
+    'servings': ('servings',),
+    'difficulty': ('difficulty',),
+    'ingredients': ('ingredients',),
+    'steps': ('steps',),
+    'country': ('country',),
+    'state': ('state',),
+    'author_id': ('author_id',),
+    'status': ('status',),
+    'likes_count': ('likes_count',),
+    'comments_count': ('comments_count',),
+    'comments': ('comments_count',),
+}
+
+FIELD_PRESETS = {
+    'full': tuple(FIELD_COLUMNS),
+    # RecipeCard ko bas itna chahiye
+    'card': ('id', 'title', 'image_url', 'cookTime', 'ready_in_minutes', 'servings', 'difficulty',
+             'country', 'state', 'likes_count'),
+}
+
+
+def parse_fields(raw):
+    """?fields=card,description -> field names (to_dict order me). Khaali = full; unknown name pe ValueError."""
+    if not raw:
+        return FIELD_PRESETS['full']
+    wanted = {'id'}
+    for name in (part.strip() for part in raw.split(',')):
+        if name in FIELD_PRESETS:
+            wanted.update(FIELD_PRESETS[name])
+        elif name in FIELD_COLUMNS:
+            wanted.add(name)
+        elif name:
+            raise ValueError(f'Unknown field: {name}')
+    return tuple(field for field in FIELD_COLUMNS if field in wanted)
+
+
+def fields_key(fields):
+    """Cache keys ke liye fieldset ka chhota stable naam."""
+    for name, preset in FIELD_PRESETS.items():
+        if fields == preset:
+            return name
+    return ','.join(fields)
+
+
+def field_columns(fields):
+    """Sirf wahi Recipe columns jo in fields ke liye chahiye (+ id, version)."""
+    names = {'id', 'version'}.union(*(FIELD_COLUMNS[field] for field in fields))
+    return [getattr(Recipe, name) for name in ('id', 'version', *sorted(names - {'id', 'version'}))]
+
+
+def project(data, fields):
+    return {field: data[field] for field in fields}
+
+
+def _comments_by_recipe(ids):
+    comments_by_recipe = {}
+    comments = [] if not ids else (
+        Comment.query.options(joinedload(Comment.user))
+        .filter(Comment.recipe_id.in_(ids))
+        .order_by(Comment.id)
+        .all()
+    )
+    for c in comments:
+        comments_by_recipe.setdefault(c.recipe_id, []).append(c)
+    return comments_by_recipe
+
+
+def serialize_recipes(recipes, fields=FIELD_PRESETS['full']):
+    """
+    Bulk version of Recipe.to_dict for list endpoints.
+
+    Har recipe pe comments + comment.user lazy-load karne se 1 + N + M
+    queries lagti thi. Like count ab Recipe.likes_count column se aata hai,
+    to page kitna bhi bada ho sirf ek extra query: comments+authors (joined),
+    aur wo bhi tabhi jab 'comments' field maanga gaya ho.
+
+    recipes Recipe objects ho sakte hain ya field_columns(fields) wali rows.
+    """
+    recipes = list(recipes)
+    comments_by_recipe = {}
+    if 'comments' in fields:
+        comments_by_recipe = _comments_by_recipe([r.id for r in recipes if r.comments_count])
+
+    def value(r, field):
+        if field == 'cookTime':
+            return r.ready_in_minutes
+        if field in ('likes_count', 'comments_count'):
+            return getattr(r, field) or 0
+        if field == 'comments':
+            return [c.to_dict() for c in comments_by_recipe.get(r.id, [])]
+        return getattr(r, field)
+
+    return [{field: value(r, field) for field in fields} for r in recipes]
+
+
+def reconcile_counters():
+    """Recompute likes_count/comments_count from the Like/Comment rows. Returns rows updated."""
+    likes = db.select(func.count(Like.id)).where(Like.recipe_id == Recipe.id).scalar_subquery()
+    comments = db.select(func.count(Comment.id)).where(Comment.recipe_id == Recipe.id).scalar_subquery()
+    stale = (Recipe.likes_count != likes) | (Recipe.comments_count != comments)
+    fixed = [recipe_id for recipe_id, in db.session.execute(db.select(Recipe.id).where(stale))]
+    if fixed:
+        db.session.execute(
+            db.update(Recipe)
+            .where(Recipe.id.in_(fixed))
+            .values(likes_count=likes, comments_count=comments, version=Recipe.version + 1, updated_at=datetime.utcnow())
+        )
+        # Bulk UPDATE pe mapper events nahi chalte, isliye catalog, cards aur change feed bhi yahin
+        bump_catalog(db.session.connection())
+        rebuild_recipe_cards(db.session.connection())
+        record_changes(db.session.connection(), fixed)
+    db.session.commit()
+    return len(fixed)
\ No newline at end of file
@@ -0,0 +1,90 @@
+import base64
+import json
+
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+
+
+def parse_limit(raw, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """?limit= ko safe range me clamp karo (galat value pe default)."""
+    try:
+        limit = int(raw)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(limit, maximum))
+
+
+def encode_cursor(values):
+    """Sort key values ko opaque, URL-safe cursor string me badlo."""
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """encode_cursor ka ulta. Tampered/garbage cursor pe ValueError."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or not values:
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def _after(column, value, descending):
+    return column < value if descending else column > value
+
+
+def keyset_page(query, id_column, limit, cursor=None, sort_column=None, descending=True):
+    """
+    Keyset pagination: default newest-first on the primary key.
+
+    OFFSET ki jagah `id < last_seen_id` use hota hai, isliye page 1 aur
+    page 1000 dono ek hi index seek hain. Ek extra row fetch karke pata
+    chalta hai ki next page hai ya nahi. Returns (rows, next_cursor).
+
+    sort_column diya ho (e.g. likes_count) to order (sort_column, id) hai, NULLs
+    aakhir me, aur cursor [last sort value, last id] hota hai. Rows me
+    sort_column.key naam ka attribute hona chahiye.
+    """
+    if cursor:
+        values = decode_cursor(cursor)
+        if sort_column is None:
+            last_id = values[0]
+        elif len(values) == 2 and (values[0] is None or isinstance(values[0], (int, float, str))):
+            last_value, last_id = values
+        else:
+            raise ValueError('Invalid cursor')
+        if not isinstance(last_id, int):
+            raise ValueError('Invalid cursor')
+        if sort_column is None:
+            query = query.filter(_after(id_column, last_id, descending))
+        elif last_value is None:
+            query = query.filter(sort_column.is_(None), _after(id_column, last_id, descending))
+        else:
+            after = (_after(sort_column, last_value, descending)
+                     | ((sort_column == last_value) & _after(id_column, last_id, descending)))
+            if sort_column.expression.nullable:
+                after = after | sort_column.is_(None)
+            query = query.filter(after)
+
+    order = id_column.desc() if descending else id_column.asc()
+    if sort_column is not None and cursor and last_value is None:
+        # NULL tail: baaki sab rows ki sort value NULL hai, to order sirf id ka ((status, id) index se seek)
+        query = query.order_by(order)
+    elif sort_column is not None:
+        sort_order = sort_column.desc() if descending else sort_column.asc()
+        if sort_column.expression.nullable:
+            query = query.order_by(sort_column.is_(None), sort_order, order)
+        else:
+            query = query.order_by(sort_order, order)
+    else:
+        query = query.order_by(order)
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([last.id] if sort_column is None else [getattr(last, sort_column.key), last.id])
+    return rows, next_cursor
@@ -0,0 +1,127 @@
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from app import app, provider
+from models import Recipe
+import translation_store
+import translation_memory
+import translator
+
+# Poore catalog ka hi/mr translation pehle se bana do, taaki /translate-recipe hamesha cache hit ho.
+#   GEMINI_RPM=15 python pretranslate_recipes.py --workers 4
+# Quota rate_limit ka shared bucket hai, isliye live app ke saath chalane pe bhi 429 nahi aata.
+# Beech me rukne pe dobara chalao: checkpoint se aage shuru hoga.
+
+CHECKPOINT_FILE = os.path.join(app.instance_path, 'pretranslate_checkpoint.json')
+BATCH_SIZE = 50
+
+
+def load_checkpoint(path):
+    """(last_id, failed ids). Failed wale last_id se peeche hain, agli run me pehle unhi ko dobara try karo."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        return data.get('last_id', 0), sorted(set(data.get('failed', [])))
+    except (OSError, ValueError):
+        return 0, []
+
+
+def save_checkpoint(path, last_id, failed=()):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'last_id': last_id, 'failed': sorted(set(failed)),
+                   'updated_at': time.strftime('%Y-%m-%d %H:%M:%S')}, f)
+    os.replace(tmp, path)
+
+
+def pretranslate(workers, langs, checkpoint, restart=False, batch_tokens=translator.BATCH_TOKEN_BUDGET):
+    with app.app_context():
+        if provider is None:
+            print("❌ No LLM provider configured (GEMINI_API_KEY / LLM_PROVIDER), nothing to do")
+            return
+
+        last_id, retry = (0, []) if restart else load_checkpoint(checkpoint)
+        approved = Recipe.query.filter(Recipe.status == 'approved')
+        total = approved.filter(Recipe.id > last_id).count() + len(retry)
+        print(f"🔄 Pre-translating {total} recipes into {', '.join(langs)} "
+              f"(resuming after id {last_id}, retrying {len(retry)} failed)")
+        # Checkpoint ke saath failed ids bhi: last_id unke aage nikal jaaye tab bhi wo chhoote nahi
+        failed_ids = set(retry)
+
+        done = translated_count = failed = calls = 0
+        started = time.monotonic()
+
+        def work(pack, lang):
+            # Kai segments ek prompt me; max_wait=None: token milne tak ruko, live requests ki tarah reject nahi
+            return translator.translate_segments(provider, pack, lang, max_wait=None, budget=batch_tokens)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                if retry:
+                    # Pichhli run ke failed recipes pehle (jo ab approved nahi rahe wo apne aap chhoot jaate hain)
+                    chunk, retry = retry[:BATCH_SIZE], retry[BATCH_SIZE:]
+                    batch = approved.filter(Recipe.id.in_(chunk)).order_by(Recipe.id).all()
+                    failed_ids.difference_update(chunk)
+                else:
+                    batch = approved.filter(Recipe.id > last_id).order_by(Recipe.id).limit(BATCH_SIZE).all()
+                    if not batch:
+                        break
+                    last_id = batch[-1].id
+
+                # Translation memory lookups aur DB writes sirf is (main) thread me, LLM calls threads me.
+                # Jo segments pehle kisi recipe me translate ho chuke, wo dobara LLM ko nahi jaate.
+                pending, known, jobs = {}, {}, []
+                for lang in langs:
+                    pending[lang] = [recipe_data for recipe_data in map(translator.source_fields, batch)
+                                     if lang in translator.missing_langs(recipe_data, [lang])]
+                    segments = [seg for recipe_data in pending[lang] for seg in translator.segments_of(recipe_data)]
+                    known[lang] = translation_memory.lookup(lang, segments)
+                    todo = list(dict.fromkeys(seg for seg in segments if seg not in known[lang]))
+                    jobs += [(lang, pool.submit(work, pack, lang))
+                             for pack in translator.pack_segments(todo, budget=batch_tokens)]
+
+                for lang, future in jobs:
+                    fresh = future.result()
+                    calls += 1
+                    translation_memory.remember(lang, fresh)
+                    known[lang].update(fresh)
+
+                for lang, items in pending.items():
+                    for recipe_data in items:
+                        translated = translator.assemble(recipe_data, known[lang])
+                        if translated is None:
+                            failed += 1
+                            failed_ids.add(recipe_data['id'])
+                            print(f"❌ Recipe {recipe_data['id']} -> {lang} failed")
+                            continue
+                        chash = translation_store.content_hash(recipe_data)
+                        translator.save_translation(recipe_data['id'], lang, chash, translated)
+                        translated_count += 1
+
+                # Poora batch ho gaya tabhi checkpoint aage badhao; is batch ke failures bhi usi me
+                save_checkpoint(checkpoint, last_id, failed_ids)
+                done += len(batch)
+                elapsed = time.monotonic() - started
+                eta = (total - done) * elapsed / done if done else 0
+                print(f"⏳ [{done}/{total}] {translated_count} translated with {calls} batched prompts, {failed} failed, "
+                      f"{elapsed:.0f}s elapsed, ~{eta:.0f}s left")
+
+        print(f"\n🎉 Done! {translated_count} translations stored, {failed} failed.")
+        if failed_ids:
+            print(f"⚠️ {len(failed_ids)} recipes failed; they are retried first on the next run.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill the translation store for all approved recipes.")
+    parser.add_argument('--workers', type=int, default=4, help="parallel LLM calls")
+    parser.add_argument('--langs', default=','.join(translator.SUPPORTED_LANGS), help="comma separated, e.g. hi,mr")
+    parser.add_argument('--checkpoint', default=CHECKPOINT_FILE)
+    parser.add_argument('--restart', action='store_true', help="ignore the checkpoint and rescan every recipe")
+    parser.add_argument('--batch-tokens', type=int, default=translator.BATCH_TOKEN_BUDGET,
+                        help="approx input tokens per batched segment prompt")
+    args = parser.parse_args()
+
+    pretranslate(args.workers, [l.strip() for l in args.langs.split(',') if l.strip()],
+                 args.checkpoint, args.restart, args.batch_tokens)
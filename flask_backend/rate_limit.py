@@ -0,0 +1,137 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+
+# Outbound API quota: har (provider, API key) ka ek token bucket. State ek chhoti SQLite file me
+# rehti hai, isliye Flask workers, seeding aur pre-translation sab milke ek hi quota share karte hain.
+#   GEMINI_RPM=15 GEMINI_BURST=5 SPOONACULAR_RPM=60 ...  (RPM 0 = limit off)
+
+DB_PATH = os.getenv('RATE_LIMIT_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'rate_limits.db'))
+
+# provider -> (requests per minute, burst)
+DEFAULT_LIMITS = {
+    'gemini': (15, 5),
+    'spoonacular': (60, 1),
+}
+
+
+class RateLimited(Exception):
+    """Bucket khaali hai aur max_wait me token nahi milega."""
+
+    def __init__(self, key, retry_after):
+        super().__init__(f'{key} rate limit exhausted, retry after {retry_after:.1f}s')
+        self.key = key
+        self.retry_after = retry_after
+
+
+class _Store:
+    """Buckets table. Har thread ka apna connection; update BEGIN IMMEDIATE me, taaki processes race na karein."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)')
+            self._local.conn = conn
+        return conn
+
+    def take(self, key, rate, burst):
+        """Ek token lo. Returns 0 agar mila, warna kitne seconds baad milega."""
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            now = time.time()
+            row = conn.execute('SELECT tokens, updated FROM buckets WHERE key = ?', (key,)).fetchone()
+            tokens = burst if row is None else min(burst, row[0] + max(0.0, now - row[1]) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            conn.execute('INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)', (key, tokens, now))
+            conn.execute('COMMIT')
+            return wait
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+
+class TokenBucket:
+    def __init__(self, key, per_minute, burst, store):
+        self.key = key
+        self.per_minute = per_minute
+        self.rate = per_minute / 60.0
+        self.burst = max(1, burst)
+        self._store = store
+        self._lock = threading.Lock()
+        self.granted = self.rejected = 0
+        self.waited_seconds = 0.0
+
+    def acquire(self, max_wait=None):
+        """
+        Token milne tak ruko (max_wait=None: jitna bhi lage). max_wait se zyada rukna pade
+        to RateLimited(retry_after) — live requests ko isi se 429 + Retry-After milta hai.
+        """
+        waited = 0.0
+        while True:
+            wait = self._store.take(self.key, self.rate, self.burst)
+            if wait <= 0:
+                with self._lock:
+                    self.granted += 1
+                    self.waited_seconds += waited
+                return waited
+            if max_wait is not None and waited + wait > max_wait:
+                with self._lock:
+                    self.rejected += 1
+                raise RateLimited(self.key, wait)
+            time.sleep(wait)
+            waited += wait
+
+    def stats(self):
+        with self._lock:
+            return {
+                'per_minute': self.per_minute,
+                'burst': self.burst,
+                'granted': self.granted,
+                'rejected': self.rejected,
+                'waited_seconds': round(self.waited_seconds, 3),
+            }
+
+
+_store = _Store(DB_PATH)
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def _limits(provider):
+    per_minute, burst = DEFAULT_LIMITS.get(provider, (0, 1))
+    prefix = provider.upper()
+    return float(os.getenv(f'{prefix}_RPM', per_minute)), int(os.getenv(f'{prefix}_BURST', burst))
+
+
+def limiter(provider, api_key=None):
+    """(provider, api_key) ka shared bucket, ya None agar us provider pe koi limit configured nahi."""
+    per_minute, burst = _limits(provider)
+    if per_minute <= 0:
+        return None
+    # Key ka hash hi store hota hai, asli API key kabhi disk pe nahi jaati
+    key = f"{provider}:{hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:12]}"
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = _buckets[key] = TokenBucket(key, per_minute, burst, _store)
+        return bucket
+
+
+def stats():
+    with _buckets_lock:
+        buckets = dict(_buckets)
+    return {key: bucket.stats() for key, bucket in buckets.items()}
@@ -0,0 +1,83 @@
+# 🔥 List/search ke server-side filters: ?country=&state=&difficulty=&max_minutes=&author=&sort=
+# Recipe aur RecipeCard dono pe chalte hain (same column names); indexes: (status, country, state)
+# aur har sort ka (status, sort key, id) — models.py
+
+EQUALITY_FILTERS = ('country', 'state', 'difficulty')
+
+# sort name -> (column, descending)
+SORTS = {
+    'newest': ('id', True),
+    'popular': ('likes_count', True),
+    'quickest': ('ready_in_minutes', False),
+    'title': ('title', False),
+}
+
+
+def parse_filters(args):
+    """request.args -> {column: value}. "All"/khaali = koi filter nahi; galat number pe ValueError."""
+    filters = {}
+    for name in EQUALITY_FILTERS:
+        value = (args.get(name) or '').strip()
+        if value and value != 'All':
+            filters[name] = value
+    for name, column in (('max_minutes', 'ready_in_minutes'), ('author', 'author_id')):
+        raw = (args.get(name) or '').strip()
+        if raw:
+            try:
+                value = int(raw)
+            except ValueError:
+                raise ValueError(f'Invalid {name}')
+            if value < 0:
+                raise ValueError(f'Invalid {name}')
+            filters[column] = value
+    return filters
+
+
+def parse_sort(raw, default='newest'):
+    sort = (raw or default).strip()
+    if sort != default and sort not in SORTS:
+        raise ValueError('Invalid sort')
+    return sort
+
+
+def apply_filters(query, model, filters):
+    for column, value in filters.items():
+        if column == 'ready_in_minutes':
+            query = query.filter(model.ready_in_minutes <= value)
+        else:
+            query = query.filter(getattr(model, column) == value)
+    return query
+
+
+def sort_column(model, sort):
+    """(column, descending) — keyset_page ke liye. 'newest' pe column None (sirf id)."""
+    name, descending = SORTS.get(sort, SORTS['newest'])
+    return (None if name == 'id' else getattr(model, name)), descending
+
+
+def order_clauses(model, sort):
+    """ORDER BY clauses for a named sort (NULLs aakhir me, id tie-break) — keyset_page jaisa hi order."""
+    name, descending = SORTS[sort]
+    column = getattr(model, name)
+    if name == 'id':
+        return [column.desc() if descending else column.asc()]
+    clauses = [column.desc() if descending else column.asc(), model.id.desc() if descending else model.id.asc()]
+    # NOT NULL column pe "IS NULL" term index order se match nahi hota (temp B-tree sort)
+    return [column.is_(None)] + clauses if column.expression.nullable else clauses
+
+
+def sql_conditions(filters, table='recipe'):
+    """Raw SQL (FTS search) ke liye: (['recipe.country = :f_country', ...], params)."""
+    clauses, params = [], {}
+    for column, value in filters.items():
+        operator = '<=' if column == 'ready_in_minutes' else '='
+        clauses.append(f'{table}.{column} {operator} :f_{column}')
+        params[f'f_{column}'] = value
+    return clauses, params
+
+
+def sql_order(sort, table='recipe'):
+    """Raw SQL ORDER BY for a named sort (NULLs aakhir me)."""
+    name, descending = SORTS[sort]
+    direction = 'DESC' if descending else 'ASC'
+    return f'{table}.{name} IS NULL, {table}.{name} {direction}, {table}.id {direction}'
@@ -0,0 +1,227 @@
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from models import db, Recipe, recipe_exists, bump_titles
+from devanagari import normalize, tokens, has_devanagari
+from recipe_filters import sql_conditions, sql_order
+
+FTS_TABLE = 'recipe_fts'
+# Hindi/Marathi titles (translation output se), rowid = recipe_id * 4 + LANG_SLOTS[lang]
+LOCAL_FTS_TABLE = 'recipe_title_fts'
+LANG_SLOTS = {'hi': 1, 'mr': 2}
+
+# bm25 column weights: title, description, ingredients, steps
+FIELD_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+
+_INDEXED_FIELDS = ('title', 'description', 'ingredients', 'steps')
+REBUILD_CHUNK = 500
+
+# init_search_index() set karta hai; non-SQLite ya FTS5 ke bina build pe False rehta hai
+_state = {'enabled': False}
+
+
+def fts_enabled():
+    return _state['enabled']
+
+
+def _flatten(items):
+    """ingredients/steps JSON (strings ya Spoonacular-style dicts) ko plain text banao."""
+    parts = []
+    for item in items or []:
+        if isinstance(item, dict):
+            item = item.get('original') or item.get('name') or item.get('step') or ''
+        parts.append(str(item))
+    return '\n'.join(parts)
+
+
+def _document(recipe):
+    return {
+        'rowid': recipe.id,
+        'title': normalize(recipe.title),
+        'description': normalize(recipe.description),
+        'ingredients': normalize(_flatten(recipe.ingredients)),
+        'steps': normalize(_flatten(recipe.steps)),
+    }
+
+
+def _index(connection, recipe):
+    connection.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :rowid"), {'rowid': recipe.id})
+    connection.execute(
+        text(f"INSERT INTO {FTS_TABLE} (rowid, title, description, ingredients, steps) "
+             "VALUES (:rowid, :title, :description, :ingredients, :steps)"),
+        _document(recipe)
+    )
+
+
+@event.listens_for(Recipe, 'after_insert')
+def _add_recipe(mapper, connection, target):
+    if _state['enabled']:
+        _index(connection, target)
+
+
+@event.listens_for(Recipe, 'after_update')
+def _update_recipe(mapper, connection, target):
+    # Like/status/image updates pe re-index mat karo, sirf text fields badle to
+    state = db.inspect(target)
+    if _state['enabled'] and any(state.attrs[f].history.has_changes() for f in _INDEXED_FIELDS):
+        _index(connection, target)
+
+
+@event.listens_for(Recipe, 'after_delete')
+def _drop_recipe(mapper, connection, target):
+    if _state['enabled']:
+        connection.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :rowid"), {'rowid': target.id})
+        connection.execute(
+            text(f"DELETE FROM {LOCAL_FTS_TABLE} WHERE rowid BETWEEN :lo AND :hi"),
+            {'lo': target.id * 4, 'hi': target.id * 4 + 3}
+        )
+
+
+def index_local_title(recipe_id, lang, title):
+    """Translated (Devanagari) title index karo taaki hi/mr voice search bina LLM ke match kare."""
+    if not _state['enabled'] or lang not in LANG_SLOTS or not title:
+        return
+    rowid = recipe_id * 4 + LANG_SLOTS[lang]
+    db.session.execute(text(f"DELETE FROM {LOCAL_FTS_TABLE} WHERE rowid = :rowid"), {'rowid': rowid})
+    db.session.execute(
+        text(f"INSERT INTO {LOCAL_FTS_TABLE} (rowid, lang, title) VALUES (:rowid, :lang, :title)"),
+        {'rowid': rowid, 'lang': lang, 'title': normalize(title)}
+    )
+    # /search ka ETag isi pe tika hai, warna naya Devanagari match purane 304 ke peeche chhup jaata
+    bump_titles(db.session.connection())
+    # Beech me recipe delete ho gayi to orphan row mat chhodo (translation_store.put_translation jaisa check)
+    if not recipe_exists(recipe_id):
+        db.session.rollback()
+        return
+    db.session.commit()
+
+
+def rebuild_search_index():
+    """
+    Poora FTS index recipe table se dobara banao. Returns indexed count.
+    Translated titles ka index (recipe_title_fts) isse nahi chhua jaata.
+    """
+    count = last_id = 0
+    # Sirf indexed columns select karo (startup pe bhi chalta hai, pending migrations ke saath)
+    columns = db.select(Recipe.id, Recipe.title, Recipe.description, Recipe.ingredients, Recipe.steps)
+    with db.engine.begin() as connection:
+        connection.execute(text(f"DELETE FROM {FTS_TABLE}"))
+        # Read bhi isi connection pe, id ke chunks me: doosre pooled connection ka khula cursor
+        # SHARED lock pakde rehta hai aur page cache bharte hi yahan ka write lock kabhi nahi milta.
+        while True:
+            chunk = connection.execute(
+                columns.where(Recipe.id > last_id).order_by(Recipe.id).limit(REBUILD_CHUNK)
+            ).all()
+            if not chunk:
+                break
+            for recipe in chunk:
+                _index(connection, recipe)
+            count += len(chunk)
+            last_id = chunk[-1].id
+    return count
+
+
+def init_search_index():
+    """
+    Create the FTS5 table if needed (app context required). Returns True when
+    FTS search is active; otherwise /search keeps using the ILIKE fallback.
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return False
+    try:
+        with db.engine.begin() as connection:
+            exists = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': FTS_TABLE}
+            ).first()
+            if not exists:
+                connection.execute(text(
+                    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                    "title, description, ingredients, steps, "
+                    "tokenize = 'unicode61 remove_diacritics 2')"
+                ))
+            # Text pehle hi devanagari.normalize() se aata hai, tokenizer sirf words todta hai
+            connection.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {LOCAL_FTS_TABLE} USING fts5("
+                "lang UNINDEXED, title, tokenize = 'unicode61')"
+            ))
+    except OperationalError as e:
+        print(f"⚠️ FTS5 unavailable, search will use ILIKE: {e}")
+        return False
+
+    _state['enabled'] = True
+    if not exists:
+        print(f"🔎 Built search index for {rebuild_search_index()} recipes")
+    return True
+
+
+def _match_expression(query, operator):
+    # Har token prefix match ("pan" -> paneer); quotes FTS syntax injection rokte hain
+    return f' {operator} '.join(f'"{t}"*' for t in tokens(query))
+
+
+def _ranked_ids(sql, query, limit, params):
+    """Sab words match karne wale pehle, warna koi bhi word."""
+    for operator in ('AND', 'OR'):
+        match = _match_expression(query, operator)
+        if not match:
+            return []
+        ids = [row[0] for row in db.session.execute(sql, {**params, 'match': match, 'limit': limit})]
+        if ids:
+            return ids
+    return []
+
+
+def matching_ids(query, status='approved', filters=None):
+    """
+    search_recipe_ids jaisa hi match (Devanagari titles pehle, har index pe AND phir OR) par bina rank/limit:
+    jis stage se /search ke results aate, usi ka recipe ids wala subquery (facets isi pe ginte hain).
+    """
+    clauses, params = sql_conditions(filters or {})
+    where = ''.join(f' AND {clause}' for clause in clauses)
+    params['status'] = status
+    stages = [(FTS_TABLE, f'{FTS_TABLE}.rowid')]
+    if has_devanagari(query):
+        stages.insert(0, (LOCAL_FTS_TABLE, f'{LOCAL_FTS_TABLE}.rowid / 4'))
+    candidates = [(table, recipe_id, _match_expression(query, operator))
+                  for table, recipe_id in stages for operator in ('AND', 'OR')]
+    if not candidates[0][2]:
+        return db.select(Recipe.id).where(db.false())
+    for table, recipe_id, match in candidates:
+        found = db.session.execute(text(
+            f"SELECT 1 FROM {table} JOIN recipe ON recipe.id = {recipe_id} "
+            f"WHERE {table} MATCH :match AND recipe.status = :status{where} LIMIT 1"
+        ), {**params, 'match': match}).first()
+        if found:
+            break
+    # Kisi stage me match na mila to loop aakhri (khaali) stage pe hi ruka hai
+    return text(f"SELECT DISTINCT {recipe_id} AS id FROM {table} WHERE {table} MATCH :match") \
+        .bindparams(match=match).columns(id=db.Integer)
+
+
+def search_recipe_ids(query, limit, status='approved', filters=None, sort='relevance'):
+    """
+    Ranked FTS5 search, sirf recipe ids (rank order me). Devanagari query pehle
+    translated-title index pe jaati hai (LLM round trip ki zarurat nahi), phir recipe content index pe.
+    filters (recipe_filters.parse_filters) match ke saath hi SQL me lagte hain; sort='relevance' = bm25.
+    """
+    clauses, params = sql_conditions(filters or {})
+    where = ''.join(f' AND {clause}' for clause in clauses)
+    params['status'] = status
+    ids = []
+    if has_devanagari(query):
+        order = f'bm25({LOCAL_FTS_TABLE})' if sort == 'relevance' else sql_order(sort)
+        ids = _ranked_ids(text(
+            f"SELECT DISTINCT recipe.id FROM {LOCAL_FTS_TABLE} "
+            f"JOIN recipe ON recipe.id = {LOCAL_FTS_TABLE}.rowid / 4 "
+            f"WHERE {LOCAL_FTS_TABLE} MATCH :match AND recipe.status = :status{where} "
+            f"ORDER BY {order} LIMIT :limit"
+        ), query, limit, params)
+    if not ids:
+        weights = ', '.join(str(w) for w in FIELD_WEIGHTS)
+        order = f'bm25({FTS_TABLE}, {weights})' if sort == 'relevance' else sql_order(sort)
+        ids = _ranked_ids(text(
+            f"SELECT recipe.id FROM {FTS_TABLE} JOIN recipe ON recipe.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH :match AND recipe.status = :status{where} "
+            f"ORDER BY {order} LIMIT :limit"
+        ), query, limit, params)
+    return ids
+
@@ -1,23 +1,17 @@
 import os
 import json
-import time
-from app import app, db
+from app import app, db, provider
 from models import Recipe
-from dotenv import load_dotenv
-import google.generativeai as genai
+import llm
 
-load_dotenv()
-
-# Setup Gemini AI
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel('gemini-flash-latest')
+# Bade JSON arrays me time lagta hai, isliye live routes se lamba deadline
+SEED_TIMEOUT_SECONDS = float(os.getenv('SEED_LLM_TIMEOUT_SECONDS', 120))
 
 # States jinki recipes chahiye
 STATES = ["Maharashtra", "Punjab", "Uttar Pradesh", "Bihar", "Tamil Nadu", "Rajasthan", "Gujarat"]
 
 def fetch_recipes_for_state(state, count):
-    print(f"\n🔄 Fetching {count} authentic recipes for {state} using Gemini AI...")
+    print(f"\n🔄 Fetching {count} authentic recipes for {state} using {provider.name}...")
     
     prompt = f"""
     You are an expert Indian Chef. Provide exactly {count} authentic and popular recipes from the Indian state of {state}.
@@ -34,8 +28,7 @@ def fetch_recipes_for_state(state, count):
     """
     
     try:
-        response = model.generate_content(prompt)
-        text = response.text.strip()
+        text = llm.generate_text(provider, prompt, timeout=SEED_TIMEOUT_SECONDS, max_wait=None).strip()
         
         # Markdown backticks hatao
         if text.startswith('```json'):
@@ -52,6 +45,9 @@ def fetch_recipes_for_state(state, count):
         return []
 
 def seed_database():
+    if provider is None:
+        print("❌ No LLM provider configured (GEMINI_API_KEY / LLM_PROVIDER), nothing to do")
+        return
     with app.app_context():
         total_saved = 0
         for state in STATES:
@@ -59,6 +55,7 @@ def seed_database():
             # 🔥 SMART LOGIC: Maharashtra ke liye 5, baaki sabke liye 3
             recipe_count = 5 if state == "Maharashtra" else 3
             
+            # 🔥 API rate limit: llm shared token bucket (GEMINI_RPM) me wait karta hai, fixed sleep nahi
             recipes = fetch_recipes_for_state(state, recipe_count)
             
             if recipes:
@@ -86,10 +83,6 @@ def seed_database():
                 print(f"✅ Saved recipes for {state}")
             else:
                 print(f"⚠️ Skipped {state} due to error.")
-
-            # 🔥 API Rate limit se bachne ke liye 6 seconds ka aaram
-            print(f"⏳ Waiting 6 seconds before fetching next state...")
-            time.sleep(6)
             
         print(f"\n🎉 Success! Total {total_saved} new Indian recipes added to database!")
 
@@ -0,0 +1,100 @@
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+
+# 🔥 Tests apni temp SQLite DB pe chalte hain (instance/recipes.db nahi chhuti), LLM stub, koi network nahi.
+# Env app import hone se pehle set hona chahiye: app.py import pe hi db.create_all() chalata hai.
+_TMP = tempfile.mkdtemp(prefix='cookbuddy-tests-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_TMP, 'recipes.db')
+os.environ['RATE_LIMIT_DB'] = os.path.join(_TMP, 'rate_limits.db')
+os.environ['LLM_PROVIDER'] = 'stub'
+os.environ['LLM_STUB_LATENCY_MS'] = '0'
+os.environ['LLM_STUB_CHUNK_MS'] = '0'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as backend  # noqa: E402
+import answer_cache  # noqa: E402
+import fragment_cache  # noqa: E402
+from models import db, User, Recipe, CatalogVersion, bump_catalog, bump_titles  # noqa: E402
+from search_index import FTS_TABLE, LOCAL_FTS_TABLE, fts_enabled  # noqa: E402
+
+ADMIN = {'email': 'admin@cookbuddy.com', 'password': 'admin123'}
+
+# Child tables pehle (FK order)
+_TABLES = ('like', 'comment', 'recipe_translation', 'recipe_change', 'recipe_card', 'recipe')
+
+
+@pytest.fixture
+def app():
+    backend.app.config['TESTING'] = True
+    backend.app.config['BCRYPT_LOG_ROUNDS'] = 4
+    with backend.app.app_context():
+        yield backend.app
+        db.session.remove()
+        _reset()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def admin_client(app):
+    client = app.test_client()
+    assert client.post('/login', json=ADMIN).status_code == 200
+    return client
+
+
+@pytest.fixture
+def admin(app):
+    return User.query.filter_by(email=ADMIN['email']).first()
+
+
+def _reset():
+    """Har test ke baad catalog khali; catalog version bump taaki in-memory caches purana snapshot na dein."""
+    with db.engine.begin() as connection:
+        for table in _TABLES:
+            connection.exec_driver_sql(f'DELETE FROM "{table}"')
+        if fts_enabled():
+            connection.exec_driver_sql(f'DELETE FROM {FTS_TABLE}')
+            connection.exec_driver_sql(f'DELETE FROM {LOCAL_FTS_TABLE}')
+        connection.execute(db.delete(User).where(User.email != ADMIN['email']))
+        bump_catalog(connection)
+        bump_titles(connection)
+        # Change feed khaali hai, to compaction ka horizon bhi wapas 0
+        connection.execute(db.update(CatalogVersion).values(compacted_seq=0))
+    fragment_cache._cache.discard(lambda key: True)
+    answer_cache._cache.discard(lambda key: True)
+
+
+def add_recipes(count, author=None, **fields):
+    """ORM se recipes (mapper events chalte hain: card, FTS, change feed). Returns ids."""
+    recipes = []
+    for i in range(count):
+        values = {'title': f'Recipe {i}', 'description': f'Tasty dish number {i}',
+                  'ingredients': ['salt', f'spice {i}'], 'steps': ['mix', 'cook'],
+                  'ready_in_minutes': 10 + i % 50, 'country': 'India', 'state': 'Gujarat',
+                  'difficulty': 'Easy', 'status': 'approved', **fields}
+        recipes.append(Recipe(author_id=author.id if author else None, **values))
+    db.session.add_all(recipes)
+    db.session.commit()
+    return [recipe.id for recipe in recipes]
+
+
+@contextmanager
+def captured_statements():
+    """Engine pe jo bhi SQL chala (statement, parameters) — routes ki asli queries, hand-copied shapes nahi."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
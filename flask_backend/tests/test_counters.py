@@ -0,0 +1,36 @@
+from models import db, Recipe, RecipeCard, catalog_version, reconcile_counters
+
+from conftest import add_recipes
+
+
+def _counters(recipe_id):
+    db.session.expire_all()
+    recipe, card = db.session.get(Recipe, recipe_id), db.session.get(RecipeCard, recipe_id)
+    return recipe.likes_count, recipe.comments_count, card.likes_count
+
+
+def test_like_and_comment_keep_counters_in_step(admin_client):
+    [recipe_id] = add_recipes(1)
+    assert admin_client.post(f'/recipe/{recipe_id}/like').get_json() == {'likes_count': 1}
+    admin_client.post(f'/recipe/{recipe_id}/comment', json={'text': 'Badhiya'})
+    assert _counters(recipe_id) == (1, 1, 1)
+
+    # Dobara like = unlike
+    assert admin_client.post(f'/recipe/{recipe_id}/like').get_json() == {'likes_count': 0}
+    assert _counters(recipe_id) == (0, 1, 0)
+
+
+def test_reconcile_repairs_drifted_counters(admin_client, app):
+    drifted, healthy = add_recipes(2)
+    admin_client.post(f'/recipe/{drifted}/like')
+    # Bulk write jo counter ko bypass kar gaya (purana code path, manual SQL)
+    db.session.execute(db.update(Recipe).where(Recipe.id == drifted).values(likes_count=7, comments_count=3))
+    db.session.commit()
+    version = catalog_version()[0]
+
+    result = app.test_cli_runner().invoke(args=['reconcile-counters'])
+    assert 'Reconciled counters for 1 recipes' in result.output
+    assert _counters(drifted) == (1, 0, 1)
+    assert _counters(healthy) == (0, 0, 0)
+    assert catalog_version()[0] > version
+    assert reconcile_counters() == 0
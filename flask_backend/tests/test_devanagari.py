@@ -0,0 +1,21 @@
+from devanagari import normalize, tokens, to_latin, phonetic_key
+
+
+def test_spelling_variants_share_one_form():
+    for a, b in (('पनीर', 'पनिर'), ('हिंदी', 'हिन्दी'), ('पँजाबी', 'पंजाबी'), ('ज़ीरा', 'जीरा'), ('पोळी', 'पोली')):
+        assert normalize(a) == normalize(b)
+    assert normalize('Paneer TIKKA') == 'paneer tikka'
+
+
+def test_tokens_keep_matras_and_drop_fillers():
+    assert tokens('पनीर') == [normalize('पनीर')]
+    assert tokens('मुझे पनीर टिक्का बनाना है।') == [normalize('पनीर'), normalize('टिक्का')]
+    assert tokens('मला पुरणपोळी करायची आहे') == [normalize('पुरणपोळी')]
+    # Sab filler ho to original words hi
+    assert tokens('कैसे बनाना') == [normalize('कैसे'), normalize('बनाना')]
+
+
+def test_spoken_and_romanized_names_meet():
+    assert to_latin('वडा पाव') == 'vadaa paav'
+    assert phonetic_key('पनीर') == phonetic_key('paneer') == phonetic_key('panir')
+    assert phonetic_key('पाव भाजी') == phonetic_key('pav bhajee')
@@ -0,0 +1,50 @@
+import threading
+from models import db, Recipe, bump_titles
+import dish_resolver
+from dish_resolver import resolve_dish
+
+from conftest import add_recipes
+
+
+def _settled(query):
+    """Purana copy ho to background rebuild poora hone do, phir resolve."""
+    resolve_dish(query)
+    builder = dish_resolver._state['builder']
+    if builder:
+        builder.join(5)
+    return resolve_dish(query)
+
+
+def test_dictionary_follows_writes_from_another_process(app):
+    [recipe_id] = add_recipes(1, title='Paneer Tikka')
+    assert _settled('paneer tikka')[0]['recipe_id'] == recipe_id
+
+    # Dusre process ka write: yahan ke mapper events nahi chalte, sirf DB me title aur stamp badalte hain
+    with db.engine.begin() as connection:
+        connection.execute(db.update(Recipe).where(Recipe.id == recipe_id).values(title='Misal Pav'))
+        bump_titles(connection)
+
+    assert _settled('misal pav')[0] == {'name': 'Misal Pav', 'recipe_id': recipe_id, 'score': 1.0}
+
+
+def test_rebuild_runs_off_the_request_path(app, monkeypatch):
+    add_recipes(1, title='Paneer Tikka')
+    assert _settled('paneer tikka')
+    recipe = Recipe.query.one()
+    recipe.title = 'Misal Pav'
+    db.session.commit()
+
+    release = threading.Event()
+    load_entries = dish_resolver._load_entries
+
+    def slow_load_entries():
+        release.wait(5)
+        return load_entries()
+
+    monkeypatch.setattr(dish_resolver, '_load_entries', slow_load_entries)
+    # Rebuild atka hua hai, phir bhi lookup turant purane copy se jawab deta hai
+    assert resolve_dish('paneer tikka')[0]['name'] == 'Paneer Tikka'
+    builder = dish_resolver._state['builder']
+    release.set()
+    builder.join(5)
+    assert resolve_dish('misal pav')[0]['name'] == 'Misal Pav'
@@ -0,0 +1,33 @@
+import facet_cache
+import translator
+
+from conftest import add_recipes
+
+
+def test_q_narrows_counts_to_search_matches(client):
+    add_recipes(2, title='Paneer Tikka', country='India', state='Punjab')
+    add_recipes(1, title='Kanda Poha', country='India', state='Maharashtra')
+
+    narrowed = client.get('/recipes/facets?q=paneer').get_json()
+    assert narrowed['total'] == 2
+    assert narrowed['state'] == {'Punjab': 2}
+    assert client.get('/recipes/facets?q=पनीर').get_json()['total'] == 0
+    assert client.get('/recipes/facets').get_json()['total'] == 3
+
+
+def test_deltas_match_a_fresh_recount(admin_client, monkeypatch):
+    monkeypatch.setattr(translator, 'queue_translation', lambda *args: None)
+    ids = add_recipes(3, state='Gujarat')
+    [pending] = add_recipes(1, status='pending', state='Kerala', ready_in_minutes=90)
+    admin_client.get('/recipes/facets')
+    rebuilds = facet_cache.stats()['rebuilds']
+
+    assert admin_client.post(f'/recipe/{ids[0]}/like').status_code == 200
+    assert admin_client.post(f'/admin/recipe/{pending}/status', json={'status': 'approved'}).status_code == 200
+    assert admin_client.delete(f'/admin/recipe/{ids[1]}/delete').status_code == 200
+
+    served = admin_client.get('/recipes/facets').get_json()
+    # In-memory deltas se aaya (dobara gina nahi), phir bhi DB ki fresh ginti jaisa
+    assert facet_cache.stats()['rebuilds'] == rebuilds
+    assert served == facet_cache.compute()
+    assert served['total'] == 3 and served['state'] == {'Gujarat': 2, 'Kerala': 1}
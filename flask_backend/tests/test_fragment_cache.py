@@ -0,0 +1,29 @@
+import gzip
+import json
+import zlib
+import fragment_cache
+
+from conftest import add_recipes
+
+
+def test_stitched_fragments_form_one_gzip_member():
+    items = [{'id': i, 'title': f'पनीर टिक्का {i}', 'steps': ['masala ' * i]} for i in range(50)]
+    fragments = [fragment_cache.encode(item) for item in items]
+    body = fragment_cache.array_body(fragments, gzip=True)
+
+    # Ek hi member: poora stream ek decompressor me khatam, peeche koi bacha hua data nahi
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    raw = decompressor.decompress(body)
+    assert decompressor.eof and decompressor.unused_data == b''
+    assert raw == fragment_cache.array_body(fragments)
+    assert json.loads(raw) == items
+    assert json.loads(gzip.decompress(fragment_cache.object_body(fragments[7], gzip=True))) == items[7]
+
+
+def test_gzip_list_response_matches_plain(client):
+    add_recipes(30, description='Bahut swaadisht ' * 20)
+    plain = client.get('/recipes?limit=30')
+    zipped = client.get('/recipes?limit=30', headers={'Accept-Encoding': 'gzip'})
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(zipped.get_data()) == plain.get_data()
+    assert zipped.headers['ETag'] == plain.headers['ETag'][:-1] + '-gz"'
@@ -0,0 +1,119 @@
+import time
+import threading
+import multiprocessing
+import pytest
+import llm
+import rate_limit
+from llm_providers import StubProvider, StubProviderError
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = llm.CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    monkeypatch.setattr(llm, '_breaker', breaker)
+    return breaker
+
+
+@pytest.fixture
+def provider(monkeypatch, request):
+    # Ek token/minute aur har test ki apni key: bucket khaali karne ke baad agla token ~60s door
+    monkeypatch.setenv('STUB_RPM', '1')
+    monkeypatch.setenv('STUB_BURST', '1')
+    provider = StubProvider(latency_ms=0)
+    provider.api_key = request.node.name
+    rate_limit.limiter(provider.name, provider.api_key).acquire()
+    return provider
+
+
+@pytest.fixture
+def bucket(provider):
+    return rate_limit.limiter(provider.name, provider.api_key)
+
+
+def test_open_breaker_takes_no_token_and_does_not_wait(breaker, provider, bucket):
+    breaker.record_failure()
+    granted, rejected = bucket.granted, bucket.rejected
+
+    started = time.monotonic()
+    with pytest.raises(llm.LLMUnavailable, match='circuit breaker open'):
+        llm._guarded_call(provider, 'Say hello', timeout=1, max_wait=5)
+    with pytest.raises(llm.LLMUnavailable, match='circuit breaker open'):
+        list(llm.stream_text(provider, 'Say hello', timeout=1, max_wait=5))
+    assert time.monotonic() - started < 1
+    assert (bucket.granted, bucket.rejected) == (granted, rejected)
+
+
+def test_rate_limited_trial_is_given_back(breaker, provider):
+    breaker.record_failure()
+    breaker.opened_at -= breaker.reset_timeout
+
+    with pytest.raises(llm.LLMRateLimited):
+        llm._guarded_call(provider, 'Say hello', timeout=1, max_wait=0)
+    # Trial provider tak gayi hi nahi: agli call ko half-open trial milna chahiye
+    assert breaker.state == 'half_open'
+    assert breaker.allow()
+
+
+def test_breaker_opens_half_opens_and_closes(breaker):
+    breaker.failure_threshold = 2
+    failing, healthy = StubProvider(latency_ms=0, error_rate=1.0), StubProvider(latency_ms=0)
+
+    for attempt in range(2):
+        with pytest.raises(StubProviderError):
+            llm._guarded_call(failing, f'Fail {attempt}', timeout=1, max_wait=0)
+    assert breaker.state == 'open'
+    with pytest.raises(llm.LLMUnavailable, match='circuit breaker open'):
+        llm._guarded_call(healthy, 'Say hello', timeout=1, max_wait=0)
+
+    # reset_timeout ke baad ek trial; wo bhi fail to phir open
+    breaker.opened_at -= breaker.reset_timeout
+    with pytest.raises(StubProviderError):
+        llm._guarded_call(failing, 'Fail again', timeout=1, max_wait=0)
+    assert breaker.stats() == {'state': 'open', 'consecutive_failures': 3, 'times_opened': 2}
+
+    breaker.opened_at -= breaker.reset_timeout
+    assert llm._guarded_call(healthy, 'Say hello', timeout=1, max_wait=0)
+    assert breaker.stats() == {'state': 'closed', 'consecutive_failures': 0, 'times_opened': 2}
+
+
+def test_pool_saturation_does_not_trip_breaker(breaker, monkeypatch):
+    executor = llm.BoundedExecutor(max_workers=1, max_queue=0)
+    monkeypatch.setattr(llm, '_executor', executor)
+    release = threading.Event()
+    busy = threading.Thread(target=executor.call, args=(lambda: release.wait(5), 5))
+    busy.start()
+    try:
+        while executor.stats()['active'] < 1:
+            time.sleep(0.001)
+        for attempt in range(3):
+            with pytest.raises(llm.LLMPoolSaturated):
+                llm._guarded_call(StubProvider(latency_ms=0), f'Prompt {attempt}', timeout=1, max_wait=0)
+    finally:
+        release.set()
+        busy.join()
+    assert breaker.stats() == {'state': 'closed', 'consecutive_failures': 0, 'times_opened': 0}
+    assert executor.stats()['rejected'] == 3
+
+
+def _coalesced_call(lock_dir, calls_file, results):
+    def work():
+        with open(calls_file, 'a') as f:
+            f.write('x')
+        time.sleep(0.3)
+        return {'text': 'ek hi jawab'}
+    results.put(llm.SingleFlight(lock_dir=lock_dir).do('same-prompt', work))
+
+
+@pytest.mark.skipif(llm.fcntl is None, reason='flock nahi (Windows)')
+def test_single_flight_coalesces_across_processes(tmp_path):
+    context = multiprocessing.get_context('fork')
+    calls_file, results = tmp_path / 'calls', context.Queue()
+    workers = [context.Process(target=_coalesced_call, args=(str(tmp_path / 'inflight'), str(calls_file), results))
+               for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    answers = [results.get(timeout=10) for _ in workers]
+    for worker in workers:
+        worker.join(10)
+    assert answers == [{'text': 'ek hi jawab'}] * 3
+    assert calls_file.read_text() == 'x'
@@ -0,0 +1,29 @@
+import json
+import pretranslate_recipes
+import translator
+from models import db, Recipe
+from conftest import add_recipes
+
+
+def _source(recipe_id):
+    return translator.source_fields(db.session.get(Recipe, recipe_id))
+
+
+def test_failed_recipes_are_retried_after_checkpoint_moves_on(app, tmp_path, monkeypatch):
+    first, flaky, last = add_recipes(3)
+    checkpoint = str(tmp_path / 'checkpoint.json')
+    assemble = translator.assemble
+    monkeypatch.setattr(translator, 'assemble',
+                        lambda recipe_data, known: None if recipe_data['id'] == flaky else assemble(recipe_data, known))
+
+    pretranslate_recipes.pretranslate(1, ['hi'], checkpoint)
+    with open(checkpoint) as f:
+        saved = json.load(f)
+    assert saved['last_id'] == last and saved['failed'] == [flaky]
+    assert translator.missing_langs(_source(flaky), ['hi']) == ['hi']
+
+    monkeypatch.setattr(translator, 'assemble', assemble)
+    pretranslate_recipes.pretranslate(1, ['hi'], checkpoint)
+    with open(checkpoint) as f:
+        assert json.load(f)['failed'] == []
+    assert translator.missing_langs(_source(flaky), ['hi']) == []
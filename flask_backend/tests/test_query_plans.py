@@ -0,0 +1,116 @@
+import pytest
+import search_index
+from models import db, User, Like, Comment
+from conftest import add_recipes, captured_statements
+
+# 🔥 Har hot route ki asli SQL (before_cursor_execute se) ka EXPLAIN QUERY PLAN. Fail agar koi step
+# table ko bina index ke scan kare, ya ORDER BY ke liye temp B-tree banaye (page order index se aana chahiye).
+# FTS MATCH queries ka bm25/sort match set pe hi hota hai, wahan temp B-tree theek hai.
+
+EXPLAINED = ('SELECT', 'UPDATE', 'DELETE', 'WITH')
+
+
+def _explain(statement, parameters):
+    return [row[-1] for row in db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)]
+
+
+def _problems(statement, plan):
+    bad = [step for step in plan
+           if step.startswith('SCAN ') and 'INDEX' not in step and 'CONSTANT ROW' not in step]
+    if ' MATCH ' not in statement:
+        bad += [step for step in plan if step.startswith('USE TEMP B-TREE') and 'ORDER BY' in step]
+    return bad
+
+
+def _check(statements):
+    failures = []
+    for statement, parameters in statements:
+        if not statement.lstrip().upper().startswith(EXPLAINED):
+            continue
+        plan = _explain(statement, parameters)
+        bad = _problems(statement, plan)
+        if bad:
+            failures.append(f"{' '.join(statement.split())}\n    -> {'; '.join(bad)}")
+    return failures
+
+
+def _get_all_pages(client, url):
+    """Pehla page aur har next cursor wala page (keyset predicates ke plans bhi)."""
+    responses = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200, url
+        responses.append(response)
+        cursor = response.headers.get('X-Next-Cursor')
+        url = response.headers['Link'][1:response.headers['Link'].index('>')] if cursor else None
+    return responses
+
+
+@pytest.fixture
+def catalog(app, admin):
+    author = User(name='Cook', email='cook@example.com')
+    author.set_password('secret')
+    db.session.add(author)
+    db.session.commit()
+    ids = add_recipes(12, author=author)
+    ids += add_recipes(4, title='Dal Tadka', country='Foreign', state=None, ready_in_minutes=None)
+    ids += add_recipes(2, title='Paneer Tikka', status='pending', author=author)
+    db.session.add_all([Like(user_id=admin.id, recipe_id=ids[0]), Comment(text='Mast', user_id=admin.id, recipe_id=ids[0])])
+    db.session.commit()
+    return {'ids': ids, 'author': author}
+
+
+LIST_ARGS = ['', 'sort=popular', 'sort=quickest', 'sort=title', 'country=India', 'country=India&state=Gujarat',
+             'country=India&state=Gujarat&sort=popular', 'max_minutes=30', 'max_minutes=30&sort=quickest',
+             'difficulty=Easy&sort=title']
+
+
+@pytest.mark.parametrize('endpoint', ['/recipes', '/recipes/cards'])
+@pytest.mark.parametrize('args', LIST_ARGS)
+def test_list_pages_use_indexes(client, catalog, endpoint, args):
+    with captured_statements() as statements:
+        _get_all_pages(client, f'{endpoint}?limit=3&{args}')
+    assert not _check(statements), '\n'.join(_check(statements))
+
+
+@pytest.mark.parametrize('url', [
+    '/recipes?author={author}', '/recipes?total=1', '/recipes?lang=hi', '/recipes/cards?lang=hi',
+    '/recipes/facets', '/recipes/facets?country=India', '/recipes/facets?max_minutes=30',
+    '/recipes/changes?since=0', '/recipe/{recipe}', '/recipe/{recipe}?fields=comments', '/recipe/{recipe}?lang=hi',
+])
+def test_read_routes_use_indexes(client, catalog, url):
+    url = url.format(author=catalog['author'].id, recipe=catalog['ids'][0])
+    with captured_statements() as statements:
+        assert client.get(url).status_code == 200
+    assert not _check(statements), '\n'.join(_check(statements))
+
+
+@pytest.mark.parametrize('fts', [True, False], ids=['fts', 'ilike'])
+@pytest.mark.parametrize('args', ['q=dal', 'q=dal&sort=popular', 'q=dal&sort=quickest', 'q=dal&sort=title',
+                                  'q=dal&country=Foreign', 'q=दाल', 'q='])
+def test_search_uses_indexes(client, catalog, monkeypatch, fts, args):
+    monkeypatch.setitem(search_index._state, 'enabled', fts and search_index.fts_enabled())
+    with captured_statements() as statements:
+        assert client.get(f'/search?{args}').status_code == 200
+    assert not _check(statements), '\n'.join(_check(statements))
+
+
+def test_signed_in_routes_use_indexes(admin_client, catalog):
+    recipe_id = catalog['ids'][1]
+    with captured_statements() as statements:
+        assert admin_client.get('/my-profile').status_code == 200
+        assert admin_client.get('/admin/pending-recipes').status_code == 200
+        assert admin_client.get(f'/recipe/{recipe_id}/is_liked').status_code == 200
+        assert admin_client.post(f'/recipe/{recipe_id}/like').status_code == 200
+        assert admin_client.post(f'/recipe/{recipe_id}/comment', json={'text': 'Badhiya'}).status_code == 200
+        assert admin_client.post(f'/admin/recipe/{catalog["ids"][-1]}/status', json={'status': 'approved'}).status_code == 200
+        assert admin_client.delete(f'/admin/recipe/{recipe_id}/delete').status_code == 200
+    assert not _check(statements), '\n'.join(_check(statements))
+
+
+@pytest.mark.parametrize('endpoint', ['/recipes', '/recipes/cards'])
+def test_quickest_pages_keep_nulls_last(client, catalog, endpoint):
+    pages = _get_all_pages(client, f'{endpoint}?limit=3&sort=quickest')
+    minutes = [(recipe['ready_in_minutes'], recipe['id']) for page in pages for recipe in page.get_json()]
+    assert len(minutes) == 16
+    assert minutes == sorted(minutes, key=lambda item: (item[0] is None, item[0] or 0, item[1]))
@@ -0,0 +1,31 @@
+import translator
+from models import db, RecipeCard, card_thumbnail
+
+from conftest import add_recipes
+
+SPOONACULAR = 'https://img.spoonacular.com/recipes/715538-556x370.jpg'
+
+
+def test_card_thumbnail_only_resizes_spoonacular_images():
+    assert card_thumbnail(SPOONACULAR) == 'https://img.spoonacular.com/recipes/715538-312x231.jpg'
+    assert card_thumbnail('http://localhost/static/uploads/abc_dal.png') == 'http://localhost/static/uploads/abc_dal.png'
+    assert card_thumbnail(None) is None
+
+
+def test_cards_follow_recipe_writes(admin_client, monkeypatch):
+    monkeypatch.setattr(translator, 'queue_translation', lambda *args: None)
+    shown, hidden = add_recipes(2, image_url=SPOONACULAR)
+
+    cards = admin_client.get('/recipes/cards').get_json()
+    assert [card['id'] for card in cards] == [hidden, shown]
+    assert cards[0]['image_url'].endswith('-312x231.jpg')
+    assert 'ingredients' not in cards[0] and 'steps' not in cards[0]
+
+    admin_client.post(f'/recipe/{shown}/like')
+    admin_client.post(f'/admin/recipe/{hidden}/status', json={'status': 'rejected'})
+    cards = admin_client.get('/recipes/cards').get_json()
+    assert [(card['id'], card['likes_count']) for card in cards] == [(shown, 1)]
+
+    admin_client.delete(f'/admin/recipe/{shown}/delete')
+    assert admin_client.get('/recipes/cards').get_json() == []
+    assert db.session.query(RecipeCard.id).all() == [(hidden,)]
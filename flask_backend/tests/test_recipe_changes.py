@@ -0,0 +1,23 @@
+from conftest import add_recipes
+
+
+def test_feed_returns_410_once_tombstones_are_compacted(admin_client, app):
+    kept, deleted = add_recipes(2)
+    admin_client.delete(f'/admin/recipe/{deleted}/delete')
+
+    feed = admin_client.get('/recipes/changes?since=0').get_json()
+    assert [recipe['id'] for recipe in feed['recipes']] == [kept]
+    assert feed['removed'] == [deleted]
+    caught_up = feed['seq']
+
+    result = app.test_cli_runner().invoke(args=['compact-recipe-changes', '--days', '0'])
+    assert 'Compacted 1 tombstones' in result.output
+
+    # Tombstone se pehle ka client delete kabhi nahi dekh paayega: poora resync
+    stale = admin_client.get('/recipes/changes?since=0')
+    assert stale.status_code == 410
+    assert stale.get_json() == {'error': 'Resync required', 'reset': True, 'seq': caught_up}
+    # Horizon ke baad wala client normal delta leta rehta hai
+    fresh = admin_client.get(f'/recipes/changes?since={caught_up}')
+    assert fresh.status_code == 200 and fresh.get_json()['removed'] == []
+    assert admin_client.get(f'/recipes/changes?since={caught_up + 1}').status_code == 410
@@ -0,0 +1,32 @@
+from conftest import add_recipes, captured_statements
+
+
+def test_deleted_recipe_id_is_not_reused(admin_client):
+    [old_id] = add_recipes(1, title='Old Dal')
+    etag = admin_client.get(f'/recipe/{old_id}').headers['ETag']
+    assert admin_client.delete(f'/admin/recipe/{old_id}/delete').status_code == 200
+
+    [new_id] = add_recipes(1, title='New Kheer')
+    assert new_id > old_id
+    assert admin_client.get(f'/recipe/{old_id}').status_code == 404
+    response = admin_client.get(f'/recipe/{new_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.get_json()['title'] == 'New Kheer'
+
+
+def test_detail_loads_only_requested_columns(client, admin):
+    [recipe_id] = add_recipes(1, title='Khichdi', ingredients=['rice', 'dal'])
+    with captured_statements() as statements:
+        response = client.get(f'/recipe/{recipe_id}?fields=title')
+    assert response.get_json() == {'id': recipe_id, 'title': 'Khichdi'}
+    loaded = ' '.join(statement for statement, _ in statements)
+    assert 'recipe.ingredients' not in loaded and 'comment' not in loaded
+
+    full = client.get(f'/recipe/{recipe_id}').get_json()
+    assert full['ingredients'] == ['rice', 'dal'] and full['comments'] == []
+
+
+def test_translated_detail_is_projected(client):
+    [recipe_id] = add_recipes(1, title='Khichdi')
+    data = client.get(f'/recipe/{recipe_id}?fields=title,cookTime&lang=hi').get_json()
+    assert set(data) == {'id', 'title', 'cookTime'}
@@ -0,0 +1,30 @@
+import pytest
+import fragment_cache
+from models import db, Comment
+from conftest import add_recipes, captured_statements
+
+
+@pytest.fixture
+def commented_catalog(app, admin):
+    ids = add_recipes(60)
+    db.session.add_all([Comment(text=f'Mast {i}', user_id=admin.id, recipe_id=i) for i in ids])
+    db.session.commit()
+    return ids
+
+
+@pytest.mark.parametrize('endpoint', ['/recipes', '/recipes?lang=hi', '/recipes/cards', '/recipes/cards?lang=hi',
+                                      '/search?q=recipe', '/search?q=recipe&lang=hi'])
+def test_list_query_count_does_not_grow_with_page_size(client, commented_catalog, endpoint):
+    separator = '&' if '?' in endpoint else '?'
+    # Pehli baar ke translations (LLM se aaye, har recipe ki store write) counting me nahi; reads hi gine jaate hain
+    assert client.get(f'{endpoint}{separator}limit=50').status_code == 200
+    counts = {}
+    for limit in (1, 10, 50):
+        # Har baar cold fragment cache: saare rows serialize hote hain (comments, authors ke saath)
+        fragment_cache._cache.discard(lambda key: True)
+        with captured_statements() as statements:
+            response = client.get(f'{endpoint}{separator}limit={limit}')
+        assert response.status_code == 200
+        assert len(response.get_json()) == limit
+        counts[limit] = len(statements)
+    assert counts[1] == counts[10] == counts[50], counts
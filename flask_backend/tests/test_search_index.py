@@ -0,0 +1,52 @@
+import threading
+from models import db, Recipe
+from search_index import FTS_TABLE, rebuild_search_index
+import translation_store
+import translator
+
+from conftest import add_recipes
+
+
+def test_rebuild_indexes_every_recipe(app):
+    add_recipes(3)
+    assert rebuild_search_index() == 3
+    assert db.session.execute(db.text(f"SELECT count(*) FROM {FTS_TABLE}")).scalar() == 3
+
+
+def test_rebuild_larger_than_page_cache(app):
+    # ~2000 * 4 KB text >> default 2 MB page cache: write transaction ko beech me pages spill karne padte hain.
+    # Read doosre connection pe khula ho to uska SHARED lock spill rok deta hai (database is locked / hang).
+    filler = 'masala ' * 600
+    db.session.execute(db.insert(Recipe), [
+        {'title': f'Bulk {i}', 'description': filler, 'ingredients': [filler], 'steps': ['cook'], 'status': 'approved'}
+        for i in range(2000)
+    ])
+    db.session.commit()
+    db.session.close()
+
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(count=_rebuild(app)), daemon=True)
+    worker.start()
+    worker.join(timeout=60)
+    assert not worker.is_alive(), "rebuild_search_index hung"
+    assert result['count'] == 2000
+    assert db.session.execute(db.text(f"SELECT count(*) FROM {FTS_TABLE}")).scalar() == 2000
+
+
+def _rebuild(app):
+    with app.app_context():
+        return rebuild_search_index()
+
+
+def test_search_etag_changes_when_local_title_indexed(client):
+    [recipe_id] = add_recipes(1, title='Paneer Tikka')
+    first = client.get('/search?q=पनीर&lang=hi')
+    assert first.get_json() == []
+    etag = first.headers['ETag']
+
+    recipe = db.session.get(Recipe, recipe_id).to_dict()
+    translator.save_translation(recipe_id, 'hi', translation_store.content_hash(recipe), {'title': 'पनीर टिक्का'})
+
+    again = client.get('/search?q=पनीर&lang=hi', headers={'If-None-Match': etag})
+    assert again.status_code == 200
+    assert [r['id'] for r in again.get_json()] == [recipe_id]
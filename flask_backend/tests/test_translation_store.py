@@ -0,0 +1,30 @@
+import translator
+from models import db, Recipe, RecipeTranslation
+from search_index import LOCAL_FTS_TABLE
+from conftest import add_recipes
+
+TRANSLATED = {'title': 'दाल', 'description': 'स्वादिष्ट', 'ingredients': ['नमक'], 'steps': ['पकाओ']}
+
+
+def _local_titles(recipe_id):
+    return db.session.execute(db.text(f"SELECT count(*) FROM {LOCAL_FTS_TABLE} WHERE rowid BETWEEN :lo AND :hi"),
+                              {'lo': recipe_id * 4, 'hi': recipe_id * 4 + 3}).scalar()
+
+
+def test_translation_is_stored(app):
+    [recipe_id] = add_recipes(1)
+    translator.save_translation(recipe_id, 'hi', '0' * 64, TRANSLATED)
+    assert RecipeTranslation.query.filter_by(recipe_id=recipe_id).count() == 1
+    assert _local_titles(recipe_id) == 1
+
+
+def test_recipe_deleted_during_translation_leaves_no_orphans(app):
+    [recipe_id] = add_recipes(1)
+    # Background worker ne recipe load ki (identity map me hai), phir admin ne doosre connection se delete kar di
+    assert db.session.get(Recipe, recipe_id) is not None
+    with db.engine.begin() as connection:
+        connection.execute(db.delete(Recipe).where(Recipe.id == recipe_id))
+
+    translator.save_translation(recipe_id, 'hi', '0' * 64, TRANSLATED)
+    assert RecipeTranslation.query.filter_by(recipe_id=recipe_id).count() == 0
+    assert _local_titles(recipe_id) == 0
@@ -0,0 +1,86 @@
+import os
+import hashlib
+from sqlalchemy.exc import IntegrityError
+from models import db, TranslationSegment
+from translation_store import ByteLRU
+
+# "1 tsp salt", "Heat oil in a pan" jaise segments saari recipes me baar baar aate hain;
+# unka translation ek baar hi hota hai. LRU (bytes bounded) -> translation_segment table.
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+LOOKUP_CHUNK = 500
+
+
+def normalize_segment(text):
+    return ' '.join(text.split()).lower()
+
+
+def segment_key(text):
+    return hashlib.sha256(normalize_segment(text).encode('utf-8')).hexdigest()
+
+
+_memory = ByteLRU(int(os.getenv('TRANSLATION_MEMORY_MAX_BYTES', DEFAULT_MAX_BYTES)))
+_db_counters = {'hits': 0, 'misses': 0}
+
+
+def lookup(lang, segments):
+    """Returns {segment: translated} un segments ke liye jo memory me hain."""
+    by_key = {}
+    for segment in segments:
+        by_key.setdefault(segment_key(segment), []).append(segment)
+
+    found, missing = {}, []
+    for key, originals in by_key.items():
+        target = _memory.get((lang, key))
+        if target is None:
+            missing.append(key)
+        else:
+            found.update((segment, target) for segment in originals)
+
+    for start in range(0, len(missing), LOOKUP_CHUNK):
+        chunk = missing[start:start + LOOKUP_CHUNK]
+        rows = db.session.query(TranslationSegment.source_hash, TranslationSegment.target).filter(
+            TranslationSegment.lang == lang, TranslationSegment.source_hash.in_(chunk)).all()
+        _db_counters['hits'] += len(rows)
+        _db_counters['misses'] += len(chunk) - len(rows)
+        for key, target in rows:
+            _memory.put((lang, key), target)
+            found.update((segment, target) for segment in by_key[key])
+    return found
+
+
+def remember(lang, translations):
+    """{source segment: translated} ko memory me daalo (pehle se maujood segments skip)."""
+    rows = {}
+    for source, target in translations.items():
+        rows.setdefault(segment_key(source), (source, target))
+    if not rows:
+        return
+
+    keys = list(rows)
+    existing = set()
+    for start in range(0, len(keys), LOOKUP_CHUNK):
+        existing.update(key for key, in db.session.query(TranslationSegment.source_hash).filter(
+            TranslationSegment.lang == lang, TranslationSegment.source_hash.in_(keys[start:start + LOOKUP_CHUNK])))
+
+    new_rows = [TranslationSegment(lang=lang, source_hash=key, source=source, target=target)
+                for key, (source, target) in rows.items() if key not in existing]
+    db.session.add_all(new_rows)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Dusre worker ne beech me kuch segments likh diye; baaki ek ek karke
+        db.session.rollback()
+        for row in new_rows:
+            db.session.add(TranslationSegment(lang=lang, source_hash=row.source_hash, source=row.source, target=row.target))
+            try:
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+
+    for key, (_, target) in rows.items():
+        if key not in existing:
+            _memory.put((lang, key), target)
+
+
+def stats():
+    return {'memory': _memory.stats(), 'db': dict(_db_counters)}
@@ -0,0 +1,158 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from sqlalchemy.exc import IntegrityError
+from models import db, RecipeTranslation, recipe_exists
+
+# Sirf yahi fields translate hote hain; baaki (likes, image...) hamesha live recipe se aate hain
+TRANSLATED_FIELDS = ('title', 'description', 'ingredients', 'steps')
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+def content_hash(recipe_data):
+    """English source fields ka stable sha256 (key order / whitespace se independent)."""
+    source = {field: recipe_data.get(field) or ('' if field in ('title', 'description') else [])
+              for field in TRANSLATED_FIELDS}
+    raw = json.dumps(source, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class ByteLRU:
+    """Thread-safe LRU bounded by approximate payload bytes, with hit/miss/eviction counters."""
+
+    def __init__(self, max_bytes, sizeof=None):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: len(json.dumps(value, ensure_ascii=False).encode('utf-8')))
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._items[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def discard(self, match):
+        """match(key) True wali saari entries hatao."""
+        with self._lock:
+            for key in [k for k in self._items if match(k)]:
+                self._bytes -= self._items.pop(key)[1]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._items),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+_memory = ByteLRU(int(os.getenv('TRANSLATION_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)))
+_db_counters = {'hits': 0, 'misses': 0}
+
+
+def get_translation(recipe_id, lang, chash):
+    """In-process LRU, phir DB. Returns translated fields dict ya None."""
+    key = (recipe_id, lang, chash)
+    payload = _memory.get(key)
+    if payload is not None:
+        return payload
+
+    row = RecipeTranslation.query.filter_by(recipe_id=recipe_id, lang=lang, content_hash=chash).first()
+    if row is None:
+        _db_counters['misses'] += 1
+        return None
+    _db_counters['hits'] += 1
+    _memory.put(key, row.payload)
+    return row.payload
+
+
+def get_translations(keys):
+    """get_translation ka batch (list pages): {(recipe_id, lang, chash): payload}, LRU misses ek hi query me."""
+    found, missing = {}, set()
+    for key in keys:
+        payload = _memory.get(key)
+        if payload is None:
+            missing.add(key)
+        else:
+            found[key] = payload
+    if missing:
+        rows = RecipeTranslation.query.filter(
+            RecipeTranslation.recipe_id.in_({key[0] for key in missing}),
+            RecipeTranslation.lang.in_({key[1] for key in missing})
+        ).all()
+        for row in rows:
+            key = (row.recipe_id, row.lang, row.content_hash)
+            if key in missing:
+                found[key] = row.payload
+                _memory.put(key, row.payload)
+        hits = sum(1 for key in missing if key in found)
+        _db_counters['hits'] += hits
+        _db_counters['misses'] += len(missing) - hits
+    return found
+
+
+def put_translation(recipe_id, lang, chash, translated):
+    """Translation save karo (DB + LRU). Purane content_hash wali rows hata di jaati hain."""
+    payload = {field: translated[field] for field in TRANSLATED_FIELDS if field in translated}
+
+    RecipeTranslation.query.filter(
+        RecipeTranslation.recipe_id == recipe_id,
+        RecipeTranslation.lang == lang,
+        RecipeTranslation.content_hash != chash
+    ).delete(synchronize_session=False)
+    db.session.add(RecipeTranslation(recipe_id=recipe_id, lang=lang, content_hash=chash, payload=payload))
+    try:
+        db.session.flush()
+        # Recipe check writes ke baad, usi transaction me: write lock ab hamare paas hai, to admin delete
+        # ya to pehle commit ho chuka (yahan dikhega) ya hamare baad hoga (forget_recipe ye rows hata dega)
+        if not recipe_exists(recipe_id):
+            db.session.rollback()
+            return payload
+        db.session.commit()
+    except IntegrityError:
+        # Dusre worker ne same translation pehle hi likh di
+        db.session.rollback()
+
+    _memory.discard(lambda key: key[0] == recipe_id and key[1] == lang and key[2] != chash)
+    _memory.put((recipe_id, lang, chash), payload)
+    return payload
+
+
+def forget_recipe(recipe_id):
+    """Recipe delete hone pe uski saari translations hatao (commit caller karega)."""
+    RecipeTranslation.query.filter_by(recipe_id=recipe_id).delete(synchronize_session=False)
+    _memory.discard(lambda key: key[0] == recipe_id)
+
+
+def stats():
+    return {'memory': _memory.stats(), 'db': dict(_db_counters)}
@@ -0,0 +1,276 @@
+import os
+import re
+import json
+from concurrent.futures import ThreadPoolExecutor
+from models import db, Recipe
+import llm
+import translation_store
+import translation_memory
+from translation_store import TRANSLATED_FIELDS
+from search_index import index_local_title
+
+# Jin languages ke liye pre-translation job aur approval queue chalti hai
+SUPPORTED_LANGS = {'hi': 'Hindi', 'mr': 'Marathi'}
+
+# List views (cards) ko sirf ye do chahiye; inki translations '<lang>-card' ke naam se alag store hoti hain
+CARD_FIELDS = ('title', 'description')
+
+# Ek segment-batch prompt ka input budget (approx tokens). Devanagari output input se 2-3x bada
+# hota hai, isliye ye model ki output limit se kaafi neeche rakha hai.
+BATCH_TOKEN_BUDGET = int(os.getenv('TRANSLATION_BATCH_TOKENS', 2500))
+BATCH_MAX_SEGMENTS = int(os.getenv('TRANSLATION_BATCH_MAX_SEGMENTS', 200))
+
+
+def source_fields(recipe):
+    """Recipe row ke wahi fields jo translate/hash hote hain (comments load kiye bina)."""
+    return {
+        'id': recipe.id,
+        'title': recipe.title,
+        'description': recipe.description,
+        'ingredients': recipe.ingredients,
+        'steps': recipe.steps,
+    }
+
+
+def parse_translation(text):
+    match = re.search(r'\{.*\}', text.strip(), re.DOTALL)
+    if not match:
+        raise ValueError("No JSON format found in AI response")
+    return json.loads(match.group(0))
+
+
+def _pick(recipe_data, fields):
+    return {field: recipe_data.get(field) or ('' if field in CARD_FIELDS else []) for field in fields}
+
+
+def _is_segment(value):
+    return isinstance(value, str) and value.strip() != ''
+
+
+def segments_of(recipe_data, fields=TRANSLATED_FIELDS):
+    """Translate hone wale text segments: title, description, har ingredient line, har step."""
+    segments = []
+    for value in _pick(recipe_data, fields).values():
+        segments.extend(v for v in (value if isinstance(value, list) else [value]) if _is_segment(v))
+    return segments
+
+
+def assemble(recipe_data, translations, fields=TRANSLATED_FIELDS):
+    """Segment translations se recipe ke fields dobara jodo; koi segment missing ho to None."""
+    result = {}
+    for field, value in _pick(recipe_data, fields).items():
+        parts = []
+        for part in (value if isinstance(value, list) else [value]):
+            if _is_segment(part):
+                if part not in translations:
+                    return None
+                part = translations[part]
+            parts.append(part)
+        result[field] = parts if isinstance(value, list) else parts[0]
+    return result
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 chars per token), sirf batch packing ke liye."""
+    return len(text) // 4 + 1
+
+
+def pack_segments(segments, budget=BATCH_TOKEN_BUDGET, max_items=BATCH_MAX_SEGMENTS):
+    """Segments ko greedy batches me baanto; budget se bada akela segment apne batch me jaata hai."""
+    batch, used = [], 0
+    for segment in segments:
+        cost = estimate_tokens(segment)
+        if batch and (used + cost > budget or len(batch) >= max_items):
+            yield batch
+            batch, used = [], 0
+        batch.append(segment)
+        used += cost
+    if batch:
+        yield batch
+
+
+def build_segment_prompt(segments, lang):
+    lang_name = SUPPORTED_LANGS.get(lang, 'Marathi')
+    source = {str(i): segment for i, segment in enumerate(segments, 1)}
+    return f"""
+    Translate every value in the following JSON into {lang_name} (Devanagari script).
+    The values are recipe titles, descriptions, ingredient lines and cooking steps.
+    Keep the keys exactly. CRITICAL: Output ONLY one valid JSON object. No markdown.
+
+    {json.dumps(source, ensure_ascii=False)}
+    """
+
+
+def _translate_pack(provider, pack, lang, max_wait):
+    try:
+        parsed = parse_translation(llm.generate_text(provider, build_segment_prompt(pack, lang), max_wait=max_wait))
+    except llm.LLMUnavailable as e:
+        print(f"❌ Segment translation ({len(pack)} -> {lang}) skipped: {e}")
+        return {}
+    except Exception as e:
+        # Ek kharab segment poora JSON bigaad sakta hai: aadha aadha karke dobara
+        print(f"❌ Segment translation ({len(pack)} -> {lang}) failed: {e}")
+        if len(pack) == 1:
+            return {}
+        mid = len(pack) // 2
+        return {**_translate_pack(provider, pack[:mid], lang, max_wait),
+                **_translate_pack(provider, pack[mid:], lang, max_wait)}
+
+    results = {}
+    for i, segment in enumerate(pack, 1):
+        translated = parsed.get(str(i)) if isinstance(parsed, dict) else None
+        if _is_segment(translated):
+            results[segment] = translated.strip()
+    if len(pack) > 1:
+        for segment in pack:
+            if segment not in results:
+                results.update(_translate_pack(provider, [segment], lang, max_wait))
+    return results
+
+
+def translate_segments(provider, segments, lang, max_wait=llm.RATE_MAX_WAIT_SECONDS, budget=BATCH_TOKEN_BUDGET):
+    """
+    Segments ko batched LLM calls me translate karo. Returns {segment: translated}; jo segment
+    batch me gaayab/kharab aaye wo akele dobara try hota hai, phir bhi fail ho to result me nahi hota.
+    DB ko touch nahi karta (pretranslate isse worker threads me chalata hai).
+    """
+    unique = {}
+    for segment in segments:
+        unique.setdefault(translation_memory.normalize_segment(segment), []).append(segment)
+    results = {}
+    for pack in pack_segments([originals[0] for originals in unique.values()], budget):
+        for segment, translated in _translate_pack(provider, pack, lang, max_wait).items():
+            results.update((original, translated) for original in unique[translation_memory.normalize_segment(segment)])
+    return results
+
+
+def translate_batch(provider, items, lang, fields=TRANSLATED_FIELDS, max_wait=llm.RATE_MAX_WAIT_SECONDS,
+                    budget=BATCH_TOKEN_BUDGET, remember=True):
+    """
+    Recipes ka translation translation memory se; sirf naye segments LLM ko jaate hain (batched).
+    Returns {recipe_id: translated fields} un recipes ke liye jo poore jud gaye.
+    remember=False: client ka bheja content (DB recipe nahi) — naye segments shared memory me nahi likhe jaate.
+    """
+    segments = [segment for recipe_data in items for segment in segments_of(recipe_data, fields)]
+    known = translation_memory.lookup(lang, segments)
+    todo = [segment for segment in segments if segment not in known]
+    if todo and provider is not None:
+        fresh = translate_segments(provider, todo, lang, max_wait, budget)
+        if remember:
+            translation_memory.remember(lang, fresh)
+        known.update(fresh)
+
+    results = {}
+    for recipe_data in items:
+        translated = assemble(recipe_data, known, fields)
+        if translated is not None:
+            results[recipe_data.get('id')] = translated
+    return results
+
+
+def translate_fields(provider, recipe_data, lang, max_wait=llm.RATE_MAX_WAIT_SECONDS, remember=True):
+    """
+    Ek recipe ka translation. Edit ke baad sirf badle hue segments (e.g. ek step) LLM ko jaate hain.
+    Poora na jud paaye to ValueError.
+    """
+    translated = translate_batch(provider, [recipe_data], lang, max_wait=max_wait,
+                                 remember=remember).get(recipe_data.get('id'))
+    if translated is None:
+        raise ValueError("Some segments could not be translated")
+    return translated
+
+
+def save_translation(recipe_id, lang, chash, translated):
+    """Store + Devanagari title index (jo dish resolver ka stamp bhi badalta hai) ek jagah se update."""
+    translation_store.put_translation(recipe_id, lang, chash, translated)
+    index_local_title(recipe_id, lang, translated.get('title'))
+
+
+def translated_recipe(provider, recipe_data, lang):
+    """
+    Canonical (DB se load ki hui) recipe ka translation: store -> Gemini -> original.
+    Gemini fail ho ya configure na ho to wahi recipe_data object (English) wapas milta hai.
+    """
+    chash = translation_store.content_hash(recipe_data)
+    cached = translation_store.get_translation(recipe_data['id'], lang, chash)
+    if cached:
+        return {**recipe_data, **cached}
+    if provider is None:
+        return recipe_data
+    try:
+        translated = translate_fields(provider, recipe_data, lang)
+    except Exception as e:
+        print(f"❌ Translation Failed: {e}")
+        return recipe_data
+    save_translation(recipe_data['id'], lang, chash, translated)
+    return {**recipe_data, **translated}
+
+
+def card_lang(lang):
+    return f'{lang}-card'
+
+
+def translated_cards(provider, recipes_data, lang):
+    """
+    List view ke liye title/description ka translation. Poori translation cached ho to wahi,
+    warna card store; dono miss hon to saare missing cards batch me (aam taur pe ek hi LLM call).
+    Jo translate na ho paaye wo English me hi rehta hai. Returns (cards, untranslated recipe ids).
+    """
+    cards, missing = {}, []
+    # Har recipe ki full aur card translation keys, ek saath (per-recipe DB lookup nahi)
+    keys = {recipe_data['id']: ((recipe_data['id'], lang, translation_store.content_hash(recipe_data)),
+                                (recipe_data['id'], card_lang(lang),
+                                 translation_store.content_hash(_pick(recipe_data, CARD_FIELDS))))
+            for recipe_data in recipes_data}
+    stored = translation_store.get_translations([key for pair in keys.values() for key in pair])
+    for recipe_data in recipes_data:
+        full_key, card_key = keys[recipe_data['id']]
+        card = stored.get(full_key) or stored.get(card_key)
+        if card:
+            cards[recipe_data['id']] = card
+        else:
+            missing.append(recipe_data)
+
+    if missing and provider is not None:
+        translated = translate_batch(provider, missing, lang, fields=CARD_FIELDS)
+        for recipe_data in missing:
+            card = translated.get(recipe_data['id'])
+            if card:
+                chash = translation_store.content_hash(_pick(recipe_data, CARD_FIELDS))
+                cards[recipe_data['id']] = translation_store.put_translation(recipe_data['id'], card_lang(lang), chash, card)
+                index_local_title(recipe_data['id'], lang, card.get('title'))
+
+    localized = [{**recipe_data, **{field: cards[recipe_data['id']][field] for field in CARD_FIELDS
+                                    if field in cards.get(recipe_data['id'], {})}}
+                 for recipe_data in recipes_data]
+    return localized, {recipe_data['id'] for recipe_data in recipes_data if recipe_data['id'] not in cards}
+
+
+def missing_langs(recipe_data, langs=SUPPORTED_LANGS):
+    chash = translation_store.content_hash(recipe_data)
+    return [lang for lang in langs if translation_store.get_translation(recipe_data['id'], lang, chash) is None]
+
+
+# --- Newly approved recipes: background queue (ek hi worker; quota ke liye live traffic se peeche wait karta hai) ---
+_queue = ThreadPoolExecutor(max_workers=1, thread_name_prefix='translation-queue')
+
+
+def _translate_in_background(app, provider, recipe_id):
+    with app.app_context():
+        recipe = db.session.get(Recipe, recipe_id)
+        if recipe is None or recipe.status != 'approved':
+            return
+        recipe_data = source_fields(recipe)
+        chash = translation_store.content_hash(recipe_data)
+        for lang in missing_langs(recipe_data):
+            try:
+                save_translation(recipe_id, lang, chash, translate_fields(provider, recipe_data, lang, max_wait=None))
+                print(f"🌍 Pre-translated recipe {recipe_id} -> {lang}")
+            except Exception as e:
+                print(f"❌ Background translation failed for {recipe_id}/{lang}: {e}")
+
+
+def queue_translation(app, provider, recipe_id):
+    """Approve hote hi recipe ko hi/mr translation ke liye queue karo."""
+    if provider is not None:
+        _queue.submit(_translate_in_background, app, provider, recipe_id)